@@ -13,9 +13,30 @@ class Config:
     HEADLESS = False
     
     # Timeouts - INCREASED for stability (FIX BUG #2, #3)
-    IMPLICIT_WAIT = 15  # Increased from 10
+    IMPLICIT_WAIT = 0  # Forced to 0 by utils.wait_policy - explicit waits own all timing
     EXPLICIT_WAIT = 30  # Increased from 20
     PAGE_LOAD_TIMEOUT = 45  # Increased from 30
+    WAIT_OVERSHOOT_TOLERANCE = 0.5  # Seconds past a wait deadline before it is reported as lost
+    INTERRUPTER_TIMEOUT = 10  # Max time the overlay watcher runs after a navigation
+    INTERRUPTER_GRACE = 1.0  # Settled page with no overlay for this long = nothing is coming
+    
+    # Client state seeded before first render (skips welcome/cookie overlays)
+    # Tests marked @pytest.mark.real_overlays keep the real overlay flow
+    SEED_CLIENT_STATE = True
+    CONSENT_COOKIES = {
+        "welcomebanner_status": "dismiss",
+        "cookieconsent_status": "dismiss"
+    }
+    SEED_BOOTSTRAP_PATH = "/robots.txt"  # Cheap same-origin page for non-Chrome seeding
+    
+    # Driver pool - sessions are reused across tests and reset in between
+    DRIVER_POOL_SIZE = 2  # Idle sessions kept per browser
+    DRIVER_MAX_USES = 20  # Recycle a session after this many tests
+    BROWSER_MEMORY_MB = 500  # Budget per concurrent browser when sizing parallel runs
+    
+    # Chromedriver cache - shared by all workers, resolved offline after first run
+    DRIVER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "juice-shop-tests", "drivers")
+    CHROMEDRIVER_VERSION = None  # Pin e.g. "143.0.7499.42"; None follows installed Chrome
     
     # Screen resolutions for responsive testing
     RESOLUTIONS = {
@@ -25,14 +46,103 @@ class Config:
         "wide": (2560, 1440)       # 2K
     }
     
+    # Device emulation for responsive testing (Chrome DevTools Protocol)
+    # "emulation" switches devices inside one browser, "launch" starts a browser per test
+    RESPONSIVE_MODE = os.environ.get("RESPONSIVE_MODE", "emulation")
+    DEVICE_PROFILES = {
+        "mobile": {
+            "dpr": 2, "mobile": True, "touch": True,
+            "user_agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+                          "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+        },
+        "tablet": {
+            "dpr": 2, "mobile": True, "touch": True,
+            "user_agent": "Mozilla/5.0 (iPad; CPU OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+                          "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+        },
+        "desktop": {"dpr": 1, "mobile": False, "touch": False, "user_agent": None},
+        "wide": {"dpr": 1, "mobile": False, "touch": False, "user_agent": None}
+    }
+    
     # Performance thresholds (in seconds) - RELAXED (FIX BUG #2)
     MAX_PAGE_LOAD_TIME = 8  # Increased from 5 (realistic for demo site)
     MAX_ELEMENT_LOAD_TIME = 5  # Increased from 3
+    PERF_COLLECT_TIMEOUT = 30  # Max wait for loadEventEnd when collecting page performance
+    PERF_LCP_SETTLE_MS = 500  # Quiet time after load so the last LCP candidate is reported
+    SEARCH_API_PATH = "/rest/products/search"  # Request that answers a product search
+    SEARCH_LATENCY_TIMEOUT = 15  # Max wait for the search response and the rendered results
+    SEARCH_API_GRACE_MS = 2000  # Grid changed, nothing in flight this long after Enter = no API call
+    PERF_WARMUP = 1  # Unmeasured iterations before sampling
+    PERF_REPETITIONS = 5  # Measured iterations per scenario and cache mode
+    PERF_CONFIDENCE = 0.95
+    PERF_BOOTSTRAP_RESAMPLES = 1000
+    
+    # Network and CPU throttling (CDP, Chromium only) so timings compare across runners
+    # Throughput in kbit/s (None = unthrottled), latency in ms added per request
+    THROTTLING_PROFILES = {
+        "none": {"latency": 0, "download_kbps": None, "upload_kbps": None, "cpu_rate": 1},
+        "cable": {"latency": 28, "download_kbps": 5000, "upload_kbps": 1000, "cpu_rate": 1},
+        "3g": {"latency": 300, "download_kbps": 1600, "upload_kbps": 768, "cpu_rate": 1},
+        "cpu4x": {"latency": 0, "download_kbps": None, "upload_kbps": None, "cpu_rate": 4}
+    }
+    PERF_THROTTLING = os.environ.get("PERF_THROTTLING", "cable").split(",")  # Profiles the perf suite runs under
+    
+    PERF_THRESHOLDS = {  # Seconds, per throttling profile, scenario and percentile ("none" for unlisted profiles)
+        "none": {
+            "home_page_load": {"p90": MAX_PAGE_LOAD_TIME},
+            "search_response": {"p90": MAX_ELEMENT_LOAD_TIME},
+            "navigation": {"p90": MAX_ELEMENT_LOAD_TIME},
+            "search_stress": {"p50": MAX_ELEMENT_LOAD_TIME, "p90": MAX_ELEMENT_LOAD_TIME * 1.5}
+        },
+        "cable": {  # 5 Mbit/s adds ~3s to the ~2 MB first load, little to cached searches
+            "home_page_load": {"p90": 12},
+            "search_response": {"p90": 6},
+            "navigation": {"p90": 6},
+            "search_stress": {"p50": 6, "p90": 9}
+        },
+        "3g": {
+            "home_page_load": {"p90": 25},
+            "search_response": {"p90": 10},
+            "navigation": {"p90": 8},
+            "search_stress": {"p50": 10, "p90": 15}
+        },
+        "cpu4x": {
+            "home_page_load": {"p90": 15},
+            "search_response": {"p90": 8},
+            "navigation": {"p90": 8},
+            "search_stress": {"p50": 8, "p90": 12}
+        }
+    }
     
     # Test data
     VALID_EMAIL = "test@juice-sh.op"
     VALID_PASSWORD = "Test123!"
     
+    # REST API (login once per worker, inject the token into the browser)
+    API_URL = os.environ.get("API_URL", "https://demo.owasp-juice.shop")  # or a local stand-in
+    API_TIMEOUT = 15
+    API_REGISTER_TEST_USER = os.environ.get("API_REGISTER_TEST_USER") == "1"  # Own instances only, never the public demo
+    AUTH_TOKEN_TTL = 3600  # Used when the token carries no exp claim
+    AUTH_TOKEN_REFRESH_MARGIN = 300  # Re-login when the token expires within this many seconds
+    
+    # Retries and quarantine
+    TEST_RETRIES = 1  # In-session re-runs of a failed test before it counts as failed (--retries)
+    RETRY_EXCLUDE_MARKERS = ("performance",)  # A slow run is a result, not a flake
+    QUARANTINE_FLAKE_RATE = 0.3  # Share of recent runs that only passed on retry
+    QUARANTINE_MIN_RUNS = 3  # Recent runs needed before a test can be quarantined
+    
+    # Environment health (fail fast when the app is down)
+    HEALTH_CHECK = True
+    HEALTH_PROBE_TIMEOUT = 10
+    CIRCUIT_BREAKER_THRESHOLD = 3  # Consecutive environment failures before skipping the rest
+    CIRCUIT_REPROBE_INTERVAL = 60  # Seconds between probes while the breaker is open
+    ENVIRONMENT_ERROR_PATTERNS = (
+        "net::ERR_", "ERR_CONNECTION", "ERR_NAME_NOT_RESOLVED", "ERR_INTERNET_DISCONNECTED",
+        "Timed out receiving message from renderer", "Max retries exceeded", "Read timed out",
+        "502 Bad Gateway", "503 Service", "504 Gateway", "session not created",
+        "Chrome version could not be detected"
+    )
+    
     # Directories
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     REPORTS_DIR = os.path.join(BASE_DIR, "reports")
@@ -44,6 +154,51 @@ class Config:
     os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
     os.makedirs(BUGS_DIR, exist_ok=True)  # NEW
     
+    # Test history (xdist scheduling)
+    TEST_HISTORY_FILE = os.path.join(REPORTS_DIR, "history", "test_history.json")
+    HISTORY_SAMPLES = 10  # Durations kept per test
+    DEFAULT_TEST_DURATION = 30  # Seconds assumed for a test with no history
+    
+    # Result cache (skip unchanged tests that already passed against the same app build)
+    RESULT_CACHE = True  # --no-cache disables lookups for one run
+    RESULT_CACHE_FILE = os.path.join(REPORTS_DIR, "history", "result_cache.json")
+    RESULT_CACHE_TTL = 7 * 24 * 3600
+    RESULT_CACHE_EXCLUDE_MARKERS = ("performance",)  # Timings depend on the environment, not the code
+    
+    # Performance samples (raw measurements of every harness run, JSON lines)
+    PERF_SAMPLES_FILE = os.path.join(REPORTS_DIR, "perf", "samples.jsonl")
+    PERF_BASELINE_DB = os.path.join(REPORTS_DIR, "perf", "baseline.sqlite")
+    LOAD_REPORTS_DIR = os.path.join(REPORTS_DIR, "load")
+    PERF_RUNNER = os.environ.get("PERF_RUNNER")  # Baseline is per runner; defaults to the host name
+    PERF_BASELINE_RUNS = 10  # Rolling baseline: last N non-regressed runs
+    PERF_BASELINE_MIN_SAMPLES = 10  # No verdict until the baseline has this many samples
+    PERF_REGRESSION_ALPHA = 0.01  # One-sided Mann-Whitney significance level
+    PERF_REGRESSION_MIN_DELTA = 0.10  # Median slowdown (fraction) needed to call it a regression
+    
+    # Concurrent browser load (pytest --load-users N)
+    LOAD_USERS = 5
+    LOAD_RAMP_UP = 30  # Seconds over which users join
+    LOAD_STEADY = 60  # Seconds with every user active
+    LOAD_RAMP_DOWN = 15  # Seconds over which users leave
+    LOAD_THINK_TIME = 1.0  # Pause between a user's journeys
+    LOAD_SEARCH_TERMS = ["apple", "juice", "banana", "orange"]
+    LOAD_BUCKET_SECONDS = 5  # Timeline resolution of the load report
+    LOAD_MAX_ERROR_RATE = 0.05
+    LOAD_THRESHOLDS = {"p90": MAX_PAGE_LOAD_TIME + MAX_ELEMENT_LOAD_TIME}  # Whole journey, seconds
+    
+    # Protocol-level API load (no browser): search, login and basket calls
+    HTTP_LOAD_TARGET = os.environ.get("HTTP_LOAD_TARGET", "standin")  # "standin" or an API base URL
+    HTTP_LOAD_RPS = 1000  # Open model: Poisson arrivals at this mean rate
+    HTTP_LOAD_DURATION = 5  # Seconds
+    HTTP_LOAD_CONNECTIONS = 64  # Keep-alive connection pool size
+    HTTP_LOAD_MAX_IN_FLIGHT = 2000  # Arrivals beyond this are counted as dropped, never queued
+    HTTP_LOAD_TIMEOUT = 5  # Per request, seconds
+    HTTP_LOAD_MIX = {"search": 0.7, "login": 0.2, "basket": 0.1}
+    HTTP_LOAD_ACCOUNTS = 20  # Users registered up front for the login and basket calls
+    HTTP_LOAD_HISTOGRAM_DIGITS = 2  # Significant digits kept by the latency histogram
+    HTTP_LOAD_MIN_THROUGHPUT = 0.9  # Achieved/target rate below this means the generator saturated
+    HTTP_LOAD_THRESHOLDS = {"p99": 0.25}  # Seconds, from the scheduled arrival
+    
     # Bug reporting settings - NEW
     AUTO_SCREENSHOT_ON_FAIL = True
     GENERATE_BUG_REPORT = True
@@ -1,7 +1,6 @@
 """
 Base Page Object Model class with common methods
 """
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
@@ -9,42 +8,174 @@ import time
 import os
 from config.config import Config
 from selenium.webdriver.common.by import By
+from utils.browser_scripts import WAIT_FOR_APP_IDLE_JS, QUERY_ELEMENTS_JS, DOM_SETTLED_JS
+from utils.wait_policy import wait_policy
+from utils.perf_metrics import collect_page_performance
+from pages.interrupters import Interrupter
+from utils.client_state import client_state
 
 class BasePage:
+    # Overlays that may pop up on this page; subclasses extend this
+    INTERRUPTERS = ()
+    
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
         self.actions = ActionChains(driver)
+        self.interrupters = list(self.INTERRUPTERS)
     
     def navigate_to(self, url):
-        """Navigate to a specific URL"""
+        """Navigate to a specific URL and clear any overlay that pops up"""
         self.driver.get(url)
-        time.sleep(1)  # Wait for page to stabilize
+        self.wait_for_document_ready()
+        # Seeded consent state means the app never shows its overlays
+        if self.interrupters and not client_state.is_seeded(self.driver, *Config.CONSENT_COOKIES):
+            self.handle_interrupters()
+    
+    def register_interrupter(self, name, locator, handler=None):
+        """Watch for an extra overlay on this page object"""
+        self.interrupters.append(Interrupter(name, locator, handler))
+    
+    def handle_interrupters(self, interrupters=None, timeout=Config.INTERRUPTER_TIMEOUT,
+                            grace=Config.INTERRUPTER_GRACE):
+        """
+        Watch all registered overlays in one poll loop and dismiss whichever appear
+        
+        Each poll is a single batched query. The loop ends as soon as every
+        overlay has been dismissed, or once the page has settled and no overlay
+        has shown up for `grace` seconds, so absent banners cost ~grace, not
+        one timeout each.
+        
+        Returns:
+            Names of the overlays that were dismissed
+        """
+        interrupters = list(self.interrupters if interrupters is None else interrupters)
+        if not interrupters:
+            return []
+        
+        locators = {i.name: i.locator for i in interrupters}
+        handled = {}
+        quiet = {"since": None}
+        
+        def tick(driver):
+            state = self.query_elements(locators)
+            visible = [i for i in interrupters if state[i.name]["visible"]]
+            now = time.monotonic()
+            
+            for interrupter in visible:
+                # Retry a dismissal that did not take effect within a second
+                if now - handled.get(interrupter.name, -1.0) < 1.0:
+                    continue
+                try:
+                    interrupter.handle(self)
+                    handled[interrupter.name] = now
+                    print(f"✓ {interrupter.name} dismissed")
+                except Exception as e:
+                    print(f"ℹ️ Could not dismiss {interrupter.name}: {e}")
+            
+            if visible:
+                quiet["since"] = None
+                return False
+            if len(handled) == len(interrupters):
+                return True
+            if driver.execute_script(DOM_SETTLED_JS):
+                quiet["since"] = quiet["since"] or now
+                return now - quiet["since"] >= grace
+            return False
+        
+        try:
+            self.wait_until(tick, timeout, "Overlays still showing", poll_frequency=0.1)
+        except TimeoutException:
+            print(f"⚠️ Overlays not cleared within {timeout}s")
+        
+        return list(handled)
+    
+    def wait_until(self, condition, timeout=Config.EXPLICIT_WAIT, message="", poll_frequency=0.5):
+        """Wait for an arbitrary condition and return its result (deadline owned by the wait policy)"""
+        return wait_policy.until(self.driver, condition, timeout, message, poll_frequency)
+    
+    def wait_for_document_ready(self, timeout=Config.PAGE_LOAD_TIMEOUT):
+        """Wait until the document has finished loading"""
+        self.wait_until(
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout, "Document did not finish loading"
+        )
+    
+    def wait_for_app_idle(self, timeout=15, quiet_ms=300):
+        """
+        Wait until the single-page app is actually idle
+        
+        Idle means Angular testabilities are stable, no fetch/XHR is in flight
+        and the DOM has not mutated for quiet_ms. Runs as one async script.
+        
+        Returns:
+            dict with idle (bool), lastSignal (angular/network/dom, the signal
+            that settled last), pending signals, inflight count and elapsedMs
+        """
+        previous_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            return self.driver.execute_async_script(WAIT_FOR_APP_IDLE_JS, int(timeout * 1000), quiet_ms)
+        except Exception as e:
+            print(f"⚠️ Readiness probe failed: {e}")
+            return {"idle": False, "lastSignal": None, "pending": ["probe"], "inflight": None, "elapsedMs": None}
+        finally:
+            self.driver.set_script_timeout(previous_timeout)
+    
+    def wait_for_url_change(self, old_url, timeout=10):
+        """Wait for a route change away from old_url, return False on timeout"""
+        try:
+            self.wait_until(EC.url_changes(old_url), timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    def wait_for_url_contains(self, fragment, timeout=10):
+        """Wait until the current URL contains fragment, return False on timeout"""
+        try:
+            self.wait_until(EC.url_contains(fragment), timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    def wait_for_stable_count(self, locator, timeout=10, poll_frequency=0.25):
+        """
+        Wait until at least one element matches and the count stops changing
+        
+        Returns:
+            Final element count (0 on timeout)
+        """
+        last = {"count": -1}
+        
+        def settled(driver):
+            count = len(driver.find_elements(*locator))
+            stable = count > 0 and count == last["count"]
+            last["count"] = count
+            return stable
+        
+        try:
+            self.wait_until(settled, timeout, f"{locator} count did not settle", poll_frequency)
+        except TimeoutException:
+            pass
+        return max(last["count"], 0)
     
     def find_element(self, locator, timeout=Config.EXPLICIT_WAIT):
         """Find element with explicit wait"""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
+            return self.wait_until(EC.presence_of_element_located(locator), timeout, f"{locator} not present")
         except TimeoutException:
             raise NoSuchElementException(f"Element {locator} not found within {timeout} seconds")
     
     def find_elements(self, locator, timeout=Config.EXPLICIT_WAIT):
         """Find multiple elements with explicit wait"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
+            self.wait_until(EC.presence_of_element_located(locator), timeout, f"{locator} not present")
             return self.driver.find_elements(*locator)
         except TimeoutException:
             return []
     
     def click(self, locator, timeout=Config.EXPLICIT_WAIT):
         """Click on element with wait"""
-        element = WebDriverWait(self.driver, timeout).until(
-            EC.element_to_be_clickable(locator)
-        )
+        element = self.wait_until(EC.element_to_be_clickable(locator), timeout, f"{locator} not clickable")
         element.click()
     
     def type_text(self, locator, text, timeout=Config.EXPLICIT_WAIT):
@@ -61,9 +192,7 @@ class BasePage:
     def is_element_visible(self, locator, timeout=5):
         """Check if element is visible"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            self.wait_until(EC.visibility_of_element_located(locator), timeout, f"{locator} not visible")
             return True
         except TimeoutException:
             return False
@@ -76,12 +205,79 @@ class BasePage:
         except NoSuchElementException:
             return False
     
+    def query_elements(self, locators):
+        """
+        Query several locators in a single WebDriver round trip
+        
+        Args:
+            locators: dict of name -> (By, value) locator
+        
+        Returns:
+            dict of name -> {present, visible, count, text}
+        """
+        specs = [dict(name=name, **self._locator_to_query(locator)) for name, locator in locators.items()]
+        return self.driver.execute_script(QUERY_ELEMENTS_JS, specs)
+    
+    def wait_for_elements(self, locators, timeout=Config.EXPLICIT_WAIT, state="visible", poll_frequency=0.25):
+        """
+        Poll a whole set of locators until every one is visible (or present)
+        
+        One script call per poll instead of one wait loop per element.
+        
+        Returns:
+            Last query_elements result, whether or not the wait succeeded
+        """
+        last = {}
+        
+        def all_ready(driver):
+            last.update(self.query_elements(locators))
+            return all(entry[state] for entry in last.values())
+        
+        try:
+            self.wait_until(all_ready, timeout, f"{list(locators)} not {state}", poll_frequency)
+        except TimeoutException:
+            missing = [name for name, entry in last.items() if not entry[state]]
+            print(f"⚠️ Not {state} after {timeout}s: {', '.join(missing)}")
+        return last
+    
+    @staticmethod
+    def _locator_to_query(locator):
+        """Translate a Selenium locator to a CSS or XPath expression for QUERY_ELEMENTS_JS"""
+        by, value = locator
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        if by == By.XPATH:
+            return {"kind": "xpath", "expr": value}
+        if by == By.CSS_SELECTOR:
+            return {"kind": "css", "expr": value}
+        if by == By.ID:
+            return {"kind": "css", "expr": f'[id="{escaped}"]'}
+        if by == By.NAME:
+            return {"kind": "css", "expr": f'[name="{escaped}"]'}
+        if by == By.CLASS_NAME:
+            return {"kind": "css", "expr": f'[class~="{escaped}"]'}
+        if by == By.TAG_NAME:
+            return {"kind": "css", "expr": value}
+        literal = f"'{value}'" if "'" not in value else f'"{value}"'
+        if by == By.LINK_TEXT:
+            return {"kind": "xpath", "expr": f"//a[normalize-space(.)={literal}]"}
+        if by == By.PARTIAL_LINK_TEXT:
+            return {"kind": "xpath", "expr": f"//a[contains(., {literal})]"}
+        raise ValueError(f"Unsupported locator strategy: {by}")
+    
+    def assert_absent(self, locator, timeout=5):
+        """
+        Assert that an element is not in the DOM
+        
+        Returns at once when nothing matches and the page has settled,
+        instead of burning the whole timeout on a negative check.
+        """
+        assert wait_policy.wait_absent(self.driver, locator, timeout), \
+            f"Element {locator} still present after {timeout} seconds"
+    
     def wait_for_element_to_disappear(self, locator, timeout=Config.EXPLICIT_WAIT):
         """Wait for element to disappear"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element_located(locator)
-            )
+            self.wait_until(EC.invisibility_of_element_located(locator), timeout, f"{locator} still visible")
             return True
         except TimeoutException:
             return False
@@ -90,7 +286,6 @@ class BasePage:
         """Scroll to element"""
         element = self.find_element(locator)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(0.5)
     
     def take_screenshot(self, name):
         """Take screenshot"""
@@ -100,38 +295,23 @@ class BasePage:
         return filepath
     
     def get_page_load_time(self):
-        """Get page load time using Navigation Timing API"""
-        navigation_start = self.driver.execute_script("return window.performance.timing.navigationStart")
-        load_complete = self.driver.execute_script("return window.performance.timing.loadEventEnd")
-        return (load_complete - navigation_start) / 1000.0  # Convert to seconds
+        """Get page load time (loadEventEnd) using Navigation Timing Level 2"""
+        return collect_page_performance(self.driver).page_load_time
+    
+    def get_page_performance(self):
+        """Navigation timing, paint, LCP and CLS of the current page"""
+        return collect_page_performance(self.driver)
+    
     def dismiss_cookie_banner(self):
         """Dismiss cookie consent banner if present - Updated 2025 version"""
-        from selenium.webdriver.common.by import By
-        import time
-
-        try:
-            # Sélecteur principal 2025 : bouton "Accept All" ou "Dismiss"
-            accept_btn = (By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'dismiss')]")
-
-            # Sélecteur alternatif : croix de fermeture du welcome banner
-            close_btn = (By.CSS_SELECTOR, "button.close-dialog, button[aria-label*='Close'], mat-icon[svgicon='times']")
-
-            # Essai 1 : Accept All / Dismiss
-            if self.is_element_visible(accept_btn, timeout=6):
-                self.click(accept_btn)
-                time.sleep(1)
-                print("Cookie banner dismissed (Accept/Dismiss button)")
-                return True
-
-            # Essai 2 : Croix de fermeture
-            if self.is_element_visible(close_btn, timeout=6):
-                self.click(close_btn)
-                time.sleep(1)
-                print("Cookie banner dismissed (Close button)")
-                return True
-
-        except Exception as e:
-            print(f"Cookie banner not found or already closed: {e}")
-
-        return False
-    
\ No newline at end of file
+        # Sélecteur principal 2025 : bouton "Accept All" ou "Dismiss"
+        accept_btn = (By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'dismiss')]")
+        
+        # Sélecteur alternatif : croix de fermeture du welcome banner
+        close_btn = (By.CSS_SELECTOR, "button.close-dialog, button[aria-label*='Close'], mat-icon[svgicon='times']")
+        
+        dismissed = self.handle_interrupters([
+            Interrupter("Cookie banner (Accept/Dismiss button)", accept_btn),
+            Interrupter("Cookie banner (Close button)", close_btn)
+        ])
+        return bool(dismissed)
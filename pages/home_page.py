@@ -3,16 +3,18 @@ Home Page Object Model - FIXED ALL BUGS VERSION
 """
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import BasePage
-import time
+from pages.interrupters import Interrupter
+from config.config import Config
+from utils.perf_metrics import collect_search_latency
 
 
 class HomePage(BasePage):
     # Locators - Multiple fallbacks for stability
     ACCOUNT_BUTTON = (By.XPATH, "//button[@id='navbarAccount'] | //span[contains(text(), 'Account')] | //button[contains(@class, 'mat-focus-indicator')]")
     LOGIN_BUTTON = (By.ID, "navbarLoginButton")
+    LOGOUT_BUTTON = (By.ID, "navbarLogoutButton")
     
     # Search elements - Multiple strategies
     SEARCH_BUTTON = (By.ID, "searchQuery")
@@ -21,11 +23,20 @@ class HomePage(BasePage):
     # Other elements - Flexible locators
     PRODUCTS_GRID = (By.CSS_SELECTOR, ".mat-grid-list, mat-grid-list, [class*='grid']")
     PRODUCT_CARDS = (By.CSS_SELECTOR, "mat-card.mat-card, mat-grid-tile, .item-card")
+    SEARCH_RESULTS = (By.CSS_SELECTOR, "app-search-result mat-grid-list, app-search-result .mat-grid-list")  # Results only
     CART_BUTTON = (By.CSS_SELECTOR, "button[aria-label*='cart'], button[routerlink='/basket'], .fa-shopping-cart")
     COOKIE_DISMISS = (By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'dismiss') or @aria-label='dismiss cookie message']")
     WELCOME_BANNER_DISMISS = (By.CSS_SELECTOR, "button[aria-label='Close Welcome Banner'], .close-dialog, button.close-dialog")
     LOGO = (By.CSS_SELECTOR, "img[alt*='OWASP'], img[src*='JuiceShop'], img[src*='logo'], .mat-toolbar img")
     SIDE_MENU_BUTTON = (By.CSS_SELECTOR, "button[aria-label*='menu'], button.mat-focus-indicator, mat-icon[role='img']")
+    SIDE_NAV = (By.CSS_SELECTOR, "mat-sidenav")
+    ACCOUNT_MENU = (By.CSS_SELECTOR, ".mat-menu-panel, .mat-mdc-menu-panel, [role='menu']")
+    
+    # Overlays raced together after every navigation
+    INTERRUPTERS = (
+        Interrupter("Welcome banner", WELCOME_BANNER_DISMISS),
+        Interrupter("Cookie banner", COOKIE_DISMISS),
+    )
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -33,66 +44,57 @@ class HomePage(BasePage):
     
     def open(self):
         """Open home page with robust waiting - FIX BUG #2 (Performance)"""
-        self.navigate_to("https://demo.owasp-juice.shop/#/")
+        # Navigation also dismisses welcome/cookie banners in one poll loop
+        self.navigate_to(Config.BASE_URL)
         
-        # Wait for Angular to initialize - FIX BUG #2
+        # Wait for Angular to render the shell - FIX BUG #2
         print("⏳ Waiting for Angular app to load...")
-        time.sleep(4)  # Increased from 3 to 4
-        
-        # Wait for critical element
         self._wait_for_app_ready()
-        
-        # Dismiss popups
-        self.dismiss_initial_popups()
-        
-        # Extra stability wait
-        time.sleep(2)
         print("✅ Page fully loaded")
     
     def _wait_for_app_ready(self):
         """Wait for Angular app to be ready - FIX BUG #3"""
+        state = self.wait_for_app_idle(timeout=15)
+        if state["idle"]:
+            print(f"✓ App idle after {state['elapsedMs']}ms (last signal: {state['lastSignal']})")
+        else:
+            print(f"⚠️ Warning: App not idle, still waiting on {', '.join(state['pending'])}")
+        
         try:
-            # Wait for products grid or logo
-            WebDriverWait(self.driver, 15).until(
-                lambda d: d.find_element(*self.PRODUCTS_GRID) or d.find_element(*self.LOGO)
-            )
+            # Idle app should already show the grid or logo
+            self.wait_until(EC.any_of(
+                EC.presence_of_element_located(self.PRODUCTS_GRID),
+                EC.presence_of_element_located(self.LOGO)
+            ), timeout=5, message="Neither products grid nor logo present")
         except:
             print("⚠️ Warning: App may not be fully ready")
     
     def dismiss_initial_popups(self):
-        """Dismiss welcome banner and cookie consent - Enhanced"""
-        # Welcome banner
-        try:
-            if self.is_element_visible(self.WELCOME_BANNER_DISMISS, timeout=5):
-                self.click(self.WELCOME_BANNER_DISMISS)
-                time.sleep(1)
-                print("✓ Welcome banner dismissed")
-        except Exception as e:
-            print(f"ℹ️ No welcome banner: {e}")
-        
-        # Cookie banner  
-        try:
-            if self.is_element_visible(self.COOKIE_DISMISS, timeout=5):
-                self.click(self.COOKIE_DISMISS)
-                time.sleep(1)
-                print("✓ Cookie banner dismissed")
-        except Exception as e:
-            print(f"ℹ️ No cookie banner: {e}")
+        """Dismiss welcome banner and cookie consent - raced in a single poll loop"""
+        return self.handle_interrupters()
     
     def click_account(self):
         """Click account button - FIX BUG #3 (Element stability)"""
-        time.sleep(1)
         try:
             self.click(self.ACCOUNT_BUTTON)
         except:
             # Fallback: try JavaScript click
             element = self.find_element(self.ACCOUNT_BUTTON)
             self.driver.execute_script("arguments[0].click();", element)
+        # Done once the account menu is open
+        self.is_element_visible(self.ACCOUNT_MENU, timeout=5)
+    
+    def is_logged_in(self):
+        """Check the account menu for a logout entry"""
+        self.click_account()
+        logged_in = self.is_element_visible(self.LOGOUT_BUTTON, timeout=3)
+        self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        return logged_in
     
     def click_login(self):
-        """Click login button"""
-        time.sleep(1)
+        """Click login button and wait for the login route"""
         self.click(self.LOGIN_BUTTON)
+        self.wait_for_url_contains("/login")
     
     def search_product(self, product_name):
         """
@@ -103,37 +105,21 @@ class HomePage(BasePage):
         
         # Strategy 1: Direct interaction with better waiting
         try:
-            time.sleep(2)  # Wait for page stability
-            
-            # Find search field with explicit wait
-            search_field = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located(self.SEARCH_BUTTON)
-            )
-            
-            # Wait until element is interactable
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.SEARCH_BUTTON)
+            # Wait until the search field is interactable
+            search_field = self.wait_until(
+                EC.element_to_be_clickable(self.SEARCH_BUTTON), timeout=15, message="Search field not clickable"
             )
             
-            # Scroll to element
+            # Scroll to element and click to focus
             self.driver.execute_script("arguments[0].scrollIntoView(true);", search_field)
-            time.sleep(0.5)
-            
-            # Click to focus
             search_field.click()
-            time.sleep(1)
             
             # Clear using JavaScript (more reliable than .clear())
             self.driver.execute_script("arguments[0].value = '';", search_field)
-            time.sleep(0.5)
             
-            # Type text
+            # Type text and press Enter
             search_field.send_keys(product_name)
-            time.sleep(1)
-            
-            # Press Enter
-            search_field.send_keys(Keys.RETURN)
-            time.sleep(2)
+            self._submit_search(search_field)
             
             print("✓ Search executed successfully")
             return True
@@ -145,29 +131,56 @@ class HomePage(BasePage):
             try:
                 search_field = self.find_element(self.SEARCH_BUTTON)
                 self.driver.execute_script(
-                    f"arguments[0].value = '{product_name}';", 
-                    search_field
+                    "arguments[0].value = arguments[1];",
+                    search_field, product_name
                 )
-                search_field.send_keys(Keys.RETURN)
-                time.sleep(2)
+                self._submit_search(search_field)
                 print("✓ Search executed via JavaScript")
                 return True
             except Exception as e2:
                 print(f"❌ All search strategies failed: {e2}")
                 return False
     
+    def measure_search(self, product_name):
+        """
+        Search and time it from browser events - no fixed or polling waits in the numbers
+        
+        Juice Shop loads the catalogue when the search page opens, so Enter on
+        that page usually filters client-side: then api_url is None and only
+        input-to-render is measured.
+        
+        Returns:
+            SearchLatency (input-to-response and response-to-render reported separately)
+        """
+        search_field = self.wait_until(
+            EC.element_to_be_clickable(self.SEARCH_BUTTON), timeout=15, message="Search field not clickable"
+        )
+        search_field.click()
+        self.driver.execute_script("arguments[0].value = '';", search_field)
+        search_field.send_keys(product_name)
+        
+        latency = collect_search_latency(self.driver, product_name, lambda: search_field.send_keys(Keys.RETURN),
+                                         self.SEARCH_RESULTS[1])
+        print(f"🔍 {latency}")
+        return latency
+    
+    def _submit_search(self, search_field):
+        """Press Enter and wait for the search route and the rendered results"""
+        old_url = self.driver.current_url
+        
+        search_field.send_keys(Keys.RETURN)
+        
+        # The search route re-uses its results grid, so wait on the route and the app settling
+        self.wait_for_url_change(old_url, timeout=10)
+        # Search request answered (or filter applied) and results rendered
+        self.wait_for_app_idle(timeout=10)
+        self.wait_until(EC.presence_of_element_located(self.PRODUCTS_GRID), timeout=10, message="Results grid missing")
+    
     def get_product_count(self):
         """Get number of products displayed - FIX BUG #3"""
         try:
-            time.sleep(3)  # Wait for products to load
-            
-            # Wait for products to appear
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(self.PRODUCT_CARDS)
-            )
-            
-            products = self.find_elements(self.PRODUCT_CARDS, timeout=10)
-            count = len(products)
+            # Wait for products to appear and the list to stop growing
+            count = self.wait_for_stable_count(self.PRODUCT_CARDS, timeout=10)
             print(f"📦 Found {count} products")
             return count
         except:
@@ -176,7 +189,6 @@ class HomePage(BasePage):
     
     def is_products_grid_visible(self):
         """Check if products grid is visible - Enhanced"""
-        time.sleep(2)
         is_visible = self.is_element_visible(self.PRODUCTS_GRID, timeout=15)
         if is_visible:
             print("✓ Products grid is visible")
@@ -185,18 +197,18 @@ class HomePage(BasePage):
         return is_visible
     
     def click_cart(self):
-        """Click shopping cart button"""
-        time.sleep(1)
+        """Click shopping cart button and wait for the route change"""
+        old_url = self.driver.current_url
         try:
             self.click(self.CART_BUTTON)
         except:
             # Fallback
             element = self.find_element(self.CART_BUTTON)
             self.driver.execute_script("arguments[0].click();", element)
+        self.wait_for_url_change(old_url)
     
     def click_side_menu(self):
         """Click side menu button - FIX BUG #4 (Mobile navigation)"""
-        time.sleep(1)
         try:
             # Try regular click first
             self.click(self.SIDE_MENU_BUTTON)
@@ -204,11 +216,20 @@ class HomePage(BasePage):
             # Fallback for mobile: JavaScript click
             element = self.find_element(self.SIDE_MENU_BUTTON)
             self.driver.execute_script("arguments[0].click();", element)
-            time.sleep(0.5)
+        # Done once the side nav has slid in
+        self.is_element_visible(self.SIDE_NAV, timeout=5)
+    
+    def check_home_elements(self, timeout=15):
+        """Wait once for logo, products grid, search field and cart button together"""
+        return self.wait_for_elements({
+            "logo": self.LOGO,
+            "products_grid": self.PRODUCTS_GRID,
+            "search_field": self.SEARCH_BUTTON,
+            "cart_button": self.CART_BUTTON
+        }, timeout=timeout)
     
     def is_logo_visible(self):
         """Check if logo is visible - FIX BUG #3"""
-        time.sleep(1)
         is_visible = self.is_element_visible(self.LOGO, timeout=15)
         if is_visible:
             print("✓ Logo is visible")
@@ -0,0 +1,35 @@
+"""
+Interrupters - overlays (banners, dialogs) that can pop up over any page
+"""
+
+
+class Interrupter:
+    """An overlay locator plus the handler that gets rid of it"""
+
+    def __init__(self, name, locator, handler=None):
+        """
+        Args:
+            name: Label used in logs and results
+            locator: (By, value) of the element that identifies / dismisses the overlay
+            handler: Callable(page, interrupter); defaults to clicking the locator
+        """
+        self.name = name
+        self.locator = locator
+        self.handler = handler
+
+    def handle(self, page):
+        """Dismiss the overlay on the given page object"""
+        if self.handler is not None:
+            self.handler(page, self)
+            return
+        elements = [e for e in page.driver.find_elements(*self.locator) if e.is_displayed()]
+        if not elements:
+            return
+        try:
+            elements[0].click()
+        except Exception:
+            # Covered by an animation or another overlay: JavaScript click
+            page.driver.execute_script("arguments[0].click();", elements[0])
+
+    def __repr__(self):
+        return f"Interrupter({self.name!r}, {self.locator!r})"
@@ -2,8 +2,8 @@
 Login Page Object Model
 """
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
-import time
 
 
 class LoginPage(BasePage):
@@ -29,9 +29,16 @@ class LoginPage(BasePage):
         self.type_text(self.PASSWORD_INPUT, password)
     
     def click_login_button(self):
-        """Click login button"""
+        """Click login button and wait until the login either navigates away or shows an error"""
         self.click(self.LOGIN_BUTTON)
-        time.sleep(2)  # Wait for login process
+        try:
+            self.wait_until(
+                lambda d: "/login" not in d.current_url
+                or any(e.is_displayed() for e in d.find_elements(*self.ERROR_MESSAGE)),
+                timeout=10
+            )
+        except TimeoutException:
+            print("⚠️ Login did not complete within 10 seconds")
     
     def check_remember_me(self):
         """Check remember me checkbox"""
@@ -3,7 +3,6 @@ Registration Page Object Model
 """
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
-import time
 
 
 class RegistrationPage(BasePage):
@@ -14,6 +13,7 @@ class RegistrationPage(BasePage):
     SECURITY_QUESTION_DROPDOWN = (By.NAME, "securityQuestion")
     SECURITY_ANSWER_INPUT = (By.ID, "securityAnswerControl")
     REGISTER_BUTTON = (By.ID, "registerButton")
+    SECURITY_QUESTION_OPTIONS = (By.CSS_SELECTOR, "mat-option")
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -34,13 +34,14 @@ class RegistrationPage(BasePage):
         """Select security question by index"""
         dropdown = self.find_element(self.SECURITY_QUESTION_DROPDOWN)
         dropdown.click()
-        time.sleep(0.5)
+        self.is_element_visible(self.SECURITY_QUESTION_OPTIONS, timeout=5)
     
     def enter_security_answer(self, answer):
         """Enter security answer"""
         self.type_text(self.SECURITY_ANSWER_INPUT, answer)
     
     def click_register(self):
-        """Click register button"""
+        """Click register button and wait for the route change"""
+        old_url = self.driver.current_url
         self.click(self.REGISTER_BUTTON)
-        time.sleep(2)
+        self.wait_for_url_change(old_url)
@@ -1,7 +1,15 @@
 """
 Pytest configuration with automatic bug reporting
 """
+import argparse
+import inspect
 import pytest
+import re
+import requests
+try:  # Private runner API used by the retry protocol, checked in pytest_configure
+    from _pytest.runner import call_and_report, show_test_item
+except ImportError:
+    call_and_report = show_test_item = None
 from datetime import datetime
 import os
 import sys
@@ -10,20 +18,264 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.bug_reporter import bug_reporter
+from utils.driver_pool import driver_pool
+from utils.client_state import client_state
+from utils.api_session import api_auth
+from utils.health import circuit_breaker, environment_incident, is_environment_failure
+from utils.impact_map import changed_symbols, impact_recorder, is_impacted
+from utils.result_cache import result_cache
+from utils.result_store import CACHED_PASS, RERUN, result_store
+from utils.sleep_budget import sleep_budget
+from utils.wait_policy import wait_policy
+from utils.test_history import TestHistory, parse_shard, test_history
+from utils.throttling import parse_profiles
 from config.config import Config
 
 
+def pytest_addoption(parser):
+    """Command line options"""
+    parser.addoption(
+        "--results-file", default=os.path.join(Config.REPORTS_DIR, "results.json"),
+        help="JSON file receiving one result entry per test (used for report fan-out)"
+    )
+    parser.addoption(
+        "--scheduler", choices=("duration", "xdist"), default="duration",
+        help="With -n/--dist load: 'duration' schedules longest tests first by history, "
+             "'xdist' keeps the stock load scheduler"
+    )
+    parser.addoption(
+        "--shard", type=parse_shard, default=None, metavar="I/N",
+        help="Run only shard I of N (1-based), split by recorded test durations"
+    )
+    parser.addoption(
+        "--shard-history", default=None, metavar="PATH",
+        help="Frozen history snapshot the shard split is computed from; pass the same file to every shard "
+             "(default: the live history, which shard runs never update)"
+    )
+    parser.addoption(
+        "--shard-digest", default=None, metavar="SHA",
+        help="Expected digest of the shard history snapshot; the run stops if it differs"
+    )
+    parser.addoption(
+        "--shard-offset", type=int, default=0, metavar="K",
+        help="Shard that gets ties first in the split, rotated per suite by run_all_tests (default: 0)"
+    )
+    parser.addoption(
+        "--no-cache", action="store_true", default=False,
+        help="Run every test even if it already passed with unchanged code and app build"
+    )
+    parser.addoption(
+        "--retries", type=int, default=Config.TEST_RETRIES,
+        help="Re-run a failed test this many times in the same warm browser before it counts"
+    )
+    parser.addoption(
+        "--quarantine", action="store_true", default=False,
+        help="Run only the quarantined (chronically flaky) tests, which normal runs leave out"
+    )
+    parser.addoption(
+        "--load-users", type=int, default=0,
+        help="Run the concurrent load tests with this many headless browsers (0 = skip them)"
+    )
+    parser.addoption(
+        "--throttling", type=parse_profiles, default=Config.PERF_THROTTLING, metavar="PROFILE[,PROFILE]",
+        help=f"Throttling profiles the performance tests run under ({', '.join(Config.THROTTLING_PROFILES)})"
+    )
+    parser.addoption(
+        "--accept-perf-baseline", action="store_true", default=False,
+        help="Record this run's performance samples as the new baseline (after an intended slowdown)"
+    )
+    parser.addoption(
+        "--http-load-rps", type=int, default=Config.HTTP_LOAD_RPS,
+        help="Arrival rate (requests/s) of the protocol-level API load test"
+    )
+    parser.addoption(
+        "--record-impact", action="store_true", default=False,
+        help="Trace which page-object methods and locators each test uses (for --impact-diff)"
+    )
+    parser.addoption(
+        "--impact-diff", default=None, metavar="REF",
+        help="Run only tests affected by the changes since a git ref, per the recorded impact map"
+    )
+
+
 def pytest_configure(config):
     """Configure pytest"""
     config.addinivalue_line("markers", "smoke: Mark test as smoke test")
     config.addinivalue_line("markers", "regression: Mark test as regression test")
     config.addinivalue_line("markers", "performance: Mark test as performance test")
+    config.addinivalue_line("markers", "load: Concurrent load test (run with --load-users N)")
+    config.addinivalue_line("markers", "standin: Runs against the local stand-in server, not the app")
+    config.addinivalue_line("markers", "unit: Pure logic test, needs neither a browser nor the app")
+    config.addinivalue_line("markers", "real_overlays: Keep the real welcome/cookie overlay flow (no state seeding)")
+    
+    if config.getoption("--retries") > 0 and not _retry_internals_available():
+        raise pytest.UsageError(
+            f"--retries relies on pytest runner internals this pytest {pytest.__version__} does not have "
+            f"(tested range pinned in requirements.txt); run with --retries 0")
+    
+    # argparse only applies type= to command-line values, not to the PERF_THROTTLING default
+    throttling = config.getoption("--throttling")
+    if isinstance(throttling, list):
+        try:
+            config.option.throttling = parse_profiles(",".join(throttling))
+        except argparse.ArgumentTypeError as e:
+            raise pytest.UsageError(f"PERF_THROTTLING: {e}")
+    
+    # Shards split from one frozen snapshot so they agree on who runs what
+    shard = config.getoption("--shard")
+    if shard is not None:
+        config.shard_history = TestHistory(config.getoption("--shard-history") or Config.TEST_HISTORY_FILE)
+        expected = config.getoption("--shard-digest")
+        if expected and config.shard_history.digest() != expected:
+            raise pytest.UsageError(f"Shard history {config.shard_history.path} has digest "
+                                    f"{config.shard_history.digest()}, expected {expected}")
+        print(f"🧩 Shard {shard[0]}/{shard[1]} split from history {config.shard_history.digest()}")
     
     print("\n" + "="*60)
     print("🚀 TEST EXECUTION STARTED")
     print("="*60)
 
 
+def pytest_generate_tests(metafunc):
+    """Run tests that take a throttling profile once per --throttling profile"""
+    if "throttling" in metafunc.fixturenames:
+        metafunc.parametrize("throttling", metafunc.config.getoption("--throttling"))
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Tag every test with its fixture profile (travels to the controller with
+    the report), then narrow the run: quarantine, impact selection, shard,
+    result cache
+    """
+    for item in items:
+        item.user_properties.append(("profile", _fixture_profile(item)))
+    
+    history = getattr(config, "shard_history", test_history)
+    quarantined = set(history.quarantined())
+    if config.getoption("--quarantine"):
+        _keep_only(config, items, quarantined)
+    elif quarantined & {item.nodeid for item in items}:
+        _keep_only(config, items, {item.nodeid for item in items} - quarantined)
+        print(f"🧪 {len(quarantined)} flaky tests quarantined (run them with --quarantine)")
+    
+    diff_ref = config.getoption("--impact-diff")
+    if diff_ref:
+        changed, other_files = changed_symbols(diff_ref)
+        if other_files:
+            print(f"🎯 Impact selection off, shared code changed: {', '.join(other_files)}")
+        else:
+            _keep_only(config, items, {item.nodeid for item in items
+                                       if is_impacted(item.nodeid, history.impact(item.nodeid), changed)})
+            print(f"🎯 Impact selection against {diff_ref}: {len(items)} tests affected")
+    
+    shard = config.getoption("--shard")
+    if shard is not None:
+        index, count = shard
+        shards = history.partition([item.nodeid for item in items], count, config.getoption("--shard-offset"))
+        _keep_only(config, items, set(shards[index - 1]))
+    
+    # Cache keys fetch the app build fingerprint: no network calls just to list tests
+    if Config.RESULT_CACHE and not config.option.collectonly:
+        use_cache = not config.getoption("--no-cache")
+        for item in items:
+            key = result_cache.key(item)
+            if key is None:
+                continue
+            item.user_properties.append(("cache_key", key))
+            hit = result_cache.lookup(key) if use_cache else None
+            if hit is not None:
+                passed_at = datetime.fromtimestamp(hit["passed_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                item.user_properties.append(("cached", True))
+                item.add_marker(pytest.mark.skip(
+                    reason=f"{CACHED_PASS}: passed {passed_at} with unchanged code and app build"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Longest-processing-time-first scheduling from the duration history"""
+    if config.getoption("dist") != "load" or config.getoption("--scheduler") != "duration":
+        return None
+    from utils.duration_scheduler import DurationScheduling
+    return DurationScheduling(config, log)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Start tracing page-object calls and skip fast while the environment is down"""
+    if item.config.getoption("--record-impact"):
+        impact_recorder.start()
+    
+    reason = circuit_breaker.check() if _needs_app(item) else None
+    if reason is not None:
+        item.user_properties.append(("environment_skip", reason))
+        pytest.skip(f"Environment down: {reason}")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Run a test with in-session retries
+
+    A failed attempt is reported as "rerun", only its function-scoped
+    fixtures are torn down (the pooled session is reset, not recycled) and
+    the test runs again. Tests without retries, and --setup-only runs
+    (no test body to retry), use the default protocol.
+    """
+    retries = item.config.getoption("--retries")
+    if (retries <= 0 or item.config.getoption("setuponly", False)
+            or any(item.get_closest_marker(m) for m in Config.RETRY_EXCLUDE_MARKERS)):
+        return None
+    
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    item.retries_left = retries
+    while True:
+        reports = _run_attempt(item, nextitem)
+        if not any(r.outcome == RERUN for r in reports):
+            break
+        item.retries_left -= 1
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def _retry_internals_available():
+    """Check the private pytest API _run_attempt needs (not covered by pytest's compatibility promise)"""
+    return (call_and_report is not None and show_test_item is not None
+            and "add_space" in inspect.signature(show_test_item).parameters
+            and hasattr(pytest.Function, "_initrequest"))
+
+
+def _run_attempt(item, nextitem):
+    """One setup/call/teardown pass, like _pytest.runner.runtestprotocol"""
+    if hasattr(item, "_request") and not item._request:
+        item._initrequest()  # Re-run: fresh fixture request
+    try:
+        reports = [call_and_report(item, "setup")]
+        if reports[0].passed:
+            if item.config.getoption("setupshow", False):
+                show_test_item(item, add_space=True)
+            reports.append(call_and_report(item, "call"))
+        if item.session.shouldfail or item.session.shouldstop:
+            nextitem = None
+        elif any(r.outcome == RERUN for r in reports):
+            nextitem = item.parent  # Tear down function scope only, keep class/module fixtures
+        reports.append(call_and_report(item, "teardown", nextitem=nextitem))
+    finally:
+        if hasattr(item, "_request"):
+            item._request = False
+            item.funcargs = None
+    return reports
+
+
+def pytest_report_teststatus(report, config):
+    """Show result cache hits and retried attempts as their own categories"""
+    if report.skipped and ("cached", True) in report.user_properties:
+        return CACHED_PASS, "c", "CACHED-PASS"
+    if report.outcome == RERUN:
+        return RERUN, "R", ("RERUN", {"yellow": True})
+    return None
+
+
 def pytest_html_report_title(report):
     """Customize HTML report title"""
     report.title = "OWASP Juice Shop - Test Automation Report"
@@ -41,6 +293,30 @@ def pytest_runtest_makereport(item, call):
     # Store report for fixture access
     setattr(item, f"report_{report.when}", report)
     
+    if report.when == "teardown" and item.config.getoption("--record-impact"):
+        try:
+            test_source = inspect.getsource(item.function)
+        except (OSError, TypeError):
+            test_source = ""
+        report.user_properties.append(("impact", impact_recorder.stop(test_source)))
+    
+    # Environment failures feed the circuit breaker and one aggregated incident, not a bug each
+    if report.failed and report.when in ("setup", "call"):
+        error_text = str(report.longrepr)
+        if is_environment_failure(error_text):
+            detail = re.sub(r"^E\s+", "", error_text.strip().splitlines()[-1])
+            circuit_breaker.record_failure(detail)
+            report.user_properties.append(("environment_failure", detail))
+            return
+    elif report.when == "call" and report.passed and _needs_app(item):
+        circuit_breaker.record_success()
+    
+    # Failures with retries left are re-run on the same warm session and only count if they reproduce
+    if (report.failed and report.when in ("setup", "call") and getattr(item, "retries_left", 0) > 0
+            and not hasattr(report, "wasxfail")):
+        report.outcome = RERUN
+        return
+    
     # If test failed, log bug automatically
     if report.when == "call" and report.failed:
         test_name = item.nodeid
@@ -60,9 +336,10 @@ def pytest_runtest_makereport(item, call):
         # Take screenshot if enabled
         screenshot_path = None
         if Config.AUTO_SCREENSHOT_ON_FAIL and hasattr(item, 'funcargs'):
-            if 'driver' in item.funcargs or hasattr(item.instance, 'driver'):
+            driver = (item.funcargs.get('driver') or item.funcargs.get('pooled_driver')
+                      or getattr(item.instance, 'driver', None))
+            if driver is not None:
                 try:
-                    driver = item.funcargs.get('driver') or item.instance.driver
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     screenshot_name = f"{test_name.replace('::', '_').replace('/', '_')}_{timestamp}.png"
                     screenshot_path = os.path.join(Config.SCREENSHOTS_DIR, screenshot_name)
@@ -71,13 +348,14 @@ def pytest_runtest_makereport(item, call):
                 except Exception as e:
                     print(f"⚠️ Could not take screenshot: {e}")
         
-        # Log the bug
-        bug_reporter.log_bug(
+        # Log the bug (also attached to the report for result bundles)
+        bug = bug_reporter.log_bug(
             test_name=test_name,
             error_message=error_message,
             severity=severity,
             screenshot_path=screenshot_path
         )
+        report.user_properties.append(("bug", bug))
 
 
 def pytest_sessionstart(session):
@@ -86,6 +364,34 @@ def pytest_sessionstart(session):
     print(f"📁 Reports Dir: {Config.REPORTS_DIR}")
     print(f"🐛 Bugs Dir: {Config.BUGS_DIR}")
     print()
+    sleep_budget.install()
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """Attribute fixed sleeps and lost wait time to the test that is starting"""
+    sleep_budget.start_test(nodeid)
+    wait_policy.start_test(nodeid)
+
+
+def pytest_runtest_logreport(report):
+    """Record every result once for the report fan-out"""
+    result_store.record(report)
+    
+    properties = dict(report.user_properties)
+    if "environment_failure" in properties:
+        environment_incident.add(report.nodeid, properties["environment_failure"])
+    elif "environment_skip" in properties and report.when == "setup":
+        environment_incident.add(report.nodeid, properties["environment_skip"])
+    
+    # Bugs logged on xdist workers travel with their reports into the controller's one bug report
+    if "bug" in properties and properties["bug"] not in bug_reporter.bugs:
+        bug_reporter.import_bugs([properties["bug"]])
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    """Stop attributing sleeps and waits to the finished test"""
+    sleep_budget.end_test()
+    wait_policy.end_test()
 
 
 def pytest_sessionfinish(session, exitstatus):
@@ -96,8 +402,34 @@ def pytest_sessionfinish(session, exitstatus):
     print(f"Total tests collected: {session.testscollected}")
     print(f"Exit status: {exitstatus}")
     
-    # Generate bug report
-    if Config.GENERATE_BUG_REPORT:
+    driver_pool.shutdown()
+    collect_only = session.config.option.collectonly  # Nothing ran: leave reports and history alone
+    
+    # Results are saved by the controller only (workers forward their reports)
+    if not hasattr(session.config, "workerinput") and not collect_only:
+        result_store.save(session.config.getoption("--results-file"))
+        if session.config.getoption("--shard") is None:  # Shard results reach the history through merge
+            test_history.update(result_store.results.values())
+        if Config.RESULT_CACHE:
+            result_cache.store(result_store.results.values())
+    
+    # Report fixed sleeping left per test
+    if not collect_only:
+        sleep_budget.generate_report(_report_tag())
+    sleep_budget.uninstall()
+    if not collect_only:
+        wait_policy.generate_report(_report_tag())
+    
+    # One bug for an environment outage instead of one per affected test, and a red run:
+    # tests skipped because the app is down did not pass
+    if not hasattr(session.config, "workerinput") and environment_incident.tests:
+        environment_incident.log(bug_reporter)
+        if session.exitstatus in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+            print(f"❌ {len(environment_incident.tests)} tests lost to an environment outage, failing the run")
+    
+    # Generate bug report (the controller's, under xdist workers forward their bugs)
+    if Config.GENERATE_BUG_REPORT and not hasattr(session.config, "workerinput"):
         print("\n🐛 Generating bug report...")
         report_path = bug_reporter.generate_report()
         if report_path:
@@ -108,6 +440,72 @@ def pytest_sessionfinish(session, exitstatus):
     print("="*60)
 
 
+def _report_tag():
+    """Suffix for per-process report files (xdist worker and/or run_all_tests suite)"""
+    parts = [os.environ.get("TEST_RUN_TAG"), os.environ.get("PYTEST_XDIST_WORKER")]
+    return "_".join(p for p in parts if p) or None
+
+
+def _needs_app(item):
+    """Unit and stand-in tests run without the app, so they say nothing about its health"""
+    return not any(item.get_closest_marker(m) for m in ("unit", "standin"))
+
+
+def _keep_only(config, items, selected):
+    """Deselect every item whose nodeid is not in selected"""
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+
+def _fixture_profile(item):
+    """Browser state a test needs: parametrize id (e.g. resolution), login, real overlays"""
+    parts = []
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None:
+        parts.append(callspec.id)
+    if "logged_in_driver" in item.fixturenames:
+        parts.append("logged_in")
+    if item.get_closest_marker("real_overlays") is not None:
+        parts.append("real_overlays")
+    return "-".join(parts) or "default"
+
+
+def _test_failed(item):
+    """Check whether setup or call of a test failed"""
+    for when in ("setup", "call"):
+        report = getattr(item, f"report_{when}", None)
+        if report is not None and report.failed:
+            return True
+    return False
+
+
+@pytest.fixture
+def pooled_driver(request):
+    """Warm Chrome session from the driver pool, reset after each test (throttled if the test has a profile)"""
+    throttling = request.getfixturevalue("throttling") if "throttling" in request.fixturenames else "none"
+    driver = driver_pool.acquire(Config.DEFAULT_BROWSER, throttling=throttling)
+    if Config.SEED_CLIENT_STATE and request.node.get_closest_marker("real_overlays") is None:
+        client_state.seed_consent(driver)
+    yield driver
+    driver_pool.release(driver, failed=_test_failed(request.node))
+
+
+@pytest.fixture
+def logged_in_driver(pooled_driver):
+    """Pooled session authenticated through the REST login (no UI login form)"""
+    try:
+        auth = api_auth.get_auth()
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 401:
+            raise
+        pytest.skip(f"{Config.VALID_EMAIL} cannot log in at {Config.API_URL} "
+                    f"(set API_REGISTER_TEST_USER=1 to create it on your own instance)")
+    api_auth.inject(pooled_driver, auth)
+    return pooled_driver
+
+
 @pytest.fixture(scope="session")
 def test_session_data():
     """Store session-wide test data"""
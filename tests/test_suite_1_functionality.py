@@ -1,41 +1,39 @@
 """
 Test Suite 1: Functional Testing
-Contains 10 test cases (5 positive + 5 negative) with boundary testing
+Contains 10 test cases (5 positive + 5 negative) with boundary testing,
+plus checks of the API-injected login session and the real overlay flow
 """
 import pytest
-import time
-from selenium.webdriver.common.by import By
 from pages.home_page import HomePage
 from pages.login_page import LoginPage
-from utils.helpers import get_driver, BoundaryValues
+from utils.helpers import BoundaryValues
 from config.config import Config
 
 
 class TestFunctionalSuite:
     
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, pooled_driver):
         """Setup before each test"""
-        self.driver = get_driver("chrome")
+        self.driver = pooled_driver
         self.home_page = HomePage(self.driver)
         self.login_page = LoginPage(self.driver)
         yield
-        self.driver.quit()
     
     # ===== POSITIVE TEST CASES (5 tests) =====
     
     def test_01_home_page_loads_successfully(self):
         """TC01: Verify home page loads with all elements"""
         self.home_page.open()
-        assert self.home_page.is_logo_visible(), "Logo not visible"
-        assert self.home_page.is_products_grid_visible(), "Products grid not visible"
+        elements = self.home_page.check_home_elements()
+        assert elements["logo"]["visible"], "Logo not visible"
+        assert elements["products_grid"]["visible"], "Products grid not visible"
         print("✓ TC01 PASSED: Home page loaded successfully")
     
     def test_02_search_valid_product(self):
         """TC02: Search for valid product returns results"""
         self.home_page.open()
         self.home_page.search_product("apple")
-        time.sleep(2)
         product_count = self.home_page.get_product_count()
         assert product_count > 0, "No products found for valid search"
         print(f"✓ TC02 PASSED: Found {product_count} products")
@@ -44,9 +42,7 @@ class TestFunctionalSuite:
         """TC03: State transition - Navigate from home to login"""
         self.home_page.open()
         self.home_page.click_account()
-        time.sleep(1)
         self.home_page.click_login()
-        time.sleep(1)
         assert self.login_page.is_element_visible(self.login_page.EMAIL_INPUT), \
             "Login page not loaded"
         print("✓ TC03 PASSED: Navigation to login page successful")
@@ -62,9 +58,7 @@ class TestFunctionalSuite:
         """TC05: Side menu opens successfully"""
         self.home_page.open()
         self.home_page.click_side_menu()
-        time.sleep(1)
-        side_menu = (By.CSS_SELECTOR, "mat-sidenav")
-        assert self.home_page.is_element_visible(side_menu, timeout=5), \
+        assert self.home_page.is_element_visible(self.home_page.SIDE_NAV, timeout=5), \
             "Side menu not visible"
         print("✓ TC05 PASSED: Side menu opens successfully")
     
@@ -74,9 +68,7 @@ class TestFunctionalSuite:
         """TC06: Boundary test - Login with empty email"""
         self.home_page.open()
         self.home_page.click_account()
-        time.sleep(1)
         self.home_page.click_login()
-        time.sleep(1)
         
         self.login_page.enter_email("")
         self.login_page.enter_password("password123")
@@ -89,9 +81,7 @@ class TestFunctionalSuite:
         """TC07: Boundary test - Invalid email format"""
         self.home_page.open()
         self.home_page.click_account()
-        time.sleep(1)
         self.home_page.click_login()
-        time.sleep(1)
         
         boundaries = BoundaryValues.get_email_boundaries()
         self.login_page.enter_email(boundaries["invalid_no_at"])
@@ -106,7 +96,6 @@ class TestFunctionalSuite:
         self.home_page.open()
         boundaries = BoundaryValues.get_search_boundaries()
         self.home_page.search_product(boundaries["special_chars"])
-        time.sleep(2)
         assert self.home_page.is_products_grid_visible(), \
             "Page should handle special characters"
         print("✓ TC08 PASSED: Special characters handled")
@@ -116,7 +105,6 @@ class TestFunctionalSuite:
         self.home_page.open()
         boundaries = BoundaryValues.get_search_boundaries()
         self.home_page.search_product(boundaries["sql_injection"])
-        time.sleep(2)
         assert self.home_page.is_products_grid_visible(), \
             "SQL injection should not break application"
         print("✓ TC09 PASSED: SQL injection attempt handled")
@@ -126,10 +114,36 @@ class TestFunctionalSuite:
         self.home_page.open()
         boundaries = BoundaryValues.get_search_boundaries()
         self.home_page.search_product(boundaries["xss_attempt"])
-        time.sleep(2)
         assert self.home_page.is_products_grid_visible(), \
             "XSS attempt should be sanitized"
         print("✓ TC10 PASSED: XSS attempt handled")
+    
+    # ===== AUTHENTICATED SESSION =====
+    
+    def test_25_session_injected_from_api_login(self, logged_in_driver):
+        """TC25: App boots logged in from a REST login token, without the UI login form"""
+        self.home_page.open()
+        assert self.home_page.is_logged_in(), "Injected API session not picked up by the app"
+        print("✓ TC25 PASSED: Logged in without the UI form")
+    
+    # ===== OVERLAYS =====
+    
+    @pytest.mark.real_overlays
+    def test_26_first_visit_overlays_dismissed(self):
+        """TC26: Welcome and cookie banners of a first visit are dismissed by the overlay watcher"""
+        self.home_page.open()
+        for name in Config.CONSENT_COOKIES:
+            cookie = self.driver.get_cookie(name)
+            assert cookie is not None and cookie["value"] == "dismiss", \
+                f"{name} cookie not set - overlay was not dismissed"
+        print("✓ TC26 PASSED: First-visit overlays dismissed")
+    
+    @pytest.mark.skipif(not Config.SEED_CLIENT_STATE, reason="Client state seeding is disabled")
+    def test_27_seeded_state_skips_overlays(self):
+        """TC27: With consent state seeded before first render the welcome banner never shows"""
+        self.home_page.open()
+        self.home_page.assert_absent(self.home_page.WELCOME_BANNER_DISMISS)
+        print("✓ TC27 PASSED: No welcome banner with seeded state")
 
 
 if __name__ == "__main__":
@@ -3,26 +3,81 @@ Test Suite 4: Responsive Design Testing
 Contains 4 test cases testing different screen resolutions
 """
 import pytest
+import json
+import os
 import time
+from datetime import datetime
 from pages.home_page import HomePage
+from utils.emulation import DeviceEmulator
 from utils.helpers import get_driver
 from config.config import Config
 
 
+# Wall time spent creating/tearing down responsive_driver, per test
+_fixture_times = []
+
+
 class TestResponsiveSuite:
     
+    @pytest.fixture(scope="class", autouse=True)
+    def fixture_timing_summary(self):
+        """Report fixture wall time for the current RESPONSIVE_MODE and compare with the other mode"""
+        yield
+        if not _fixture_times:
+            return
+        
+        timing_file = os.path.join(Config.REPORTS_DIR, "responsive_fixture_timing.json")
+        try:
+            with open(timing_file, encoding="utf-8") as f:
+                history = json.load(f)
+        except (OSError, ValueError):
+            history = {}
+        
+        total = sum(_fixture_times)
+        history[Config.RESPONSIVE_MODE] = {
+            "tests": len(_fixture_times),
+            "total_s": round(total, 3),
+            "mean_s": round(total / len(_fixture_times), 3),
+            "recorded": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        with open(timing_file, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        
+        print(f"\n⏱️ responsive_driver ({Config.RESPONSIVE_MODE}): {total:.2f}s for {len(_fixture_times)} tests")
+        other = history.get("launch" if Config.RESPONSIVE_MODE == "emulation" else "emulation")
+        if other:
+            print(f"   Last run in other mode: {other['total_s']:.2f}s for {other['tests']} tests "
+                  f"(mean {other['mean_s']:.2f}s vs {total / len(_fixture_times):.2f}s)")
+    
     @pytest.fixture(params=[
         ("mobile", Config.RESOLUTIONS["mobile"]),
         ("tablet", Config.RESOLUTIONS["tablet"]),
         ("desktop", Config.RESOLUTIONS["desktop"]),
         ("wide", Config.RESOLUTIONS["wide"])
-    ])
+    ], ids=["mobile", "tablet", "desktop", "wide"])
     def responsive_driver(self, request):
-        """Fixture for different screen resolutions"""
+        """Fixture for different screen resolutions (CDP emulation in one warm browser by default)"""
         device_name, resolution = request.param
-        driver = get_driver("chrome", resolution=resolution)
+        
+        start = time.perf_counter()
+        if Config.RESPONSIVE_MODE == "launch":
+            driver = get_driver("chrome", resolution=resolution)
+        else:
+            # No reload: the profile is applied on about:blank and every test opens the app
+            # afterwards, so bootstrap-only media queries and the user agent see the device
+            driver = request.getfixturevalue("pooled_driver")
+            emulator = DeviceEmulator(driver)
+            emulator.apply(device_name)
+        _fixture_times.append(time.perf_counter() - start)
+        
         yield driver, device_name, resolution
-        driver.quit()
+        
+        start = time.perf_counter()
+        if Config.RESPONSIVE_MODE == "launch":
+            driver.quit()
+        else:
+            emulator.clear()
+        _fixture_times[-1] += time.perf_counter() - start
     
     def test_19_responsive_home_page(self, responsive_driver):
         """TC19: Verify home page displays at all resolutions"""
@@ -69,7 +124,6 @@ class TestResponsiveSuite:
         
         home_page.open()
         home_page.search_product("juice")
-        time.sleep(2)
         
         product_count = home_page.get_product_count()
         assert product_count >= 0, f"Search failed on {device}"
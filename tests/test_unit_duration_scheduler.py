@@ -0,0 +1,72 @@
+"""
+Unit tests: longest-first xdist work units from duration history
+"""
+import pytest
+import utils.duration_scheduler as duration_scheduler
+from utils.duration_scheduler import DurationScheduling
+from utils.test_history import TestHistory
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """Empty history file swapped in for the global one"""
+    history = TestHistory(path=str(tmp_path / "history.json"))
+    monkeypatch.setattr(duration_scheduler, "test_history", history)
+    return history
+
+
+def record(history, durations, profiles=None):
+    history.update([{"nodeid": nodeid, "outcome": "passed", "duration": duration,
+                     "profile": (profiles or {}).get(nodeid)} for nodeid, duration in durations.items()])
+
+
+def build_units(collection, workers):
+    # build_units only reads the history, no xdist session needed
+    return DurationScheduling.__new__(DurationScheduling).build_units(collection, workers)
+
+
+def test_every_test_is_scheduled_once(history):
+    record(history, {"a": 5, "b": 1}, {"a": "mobile", "b": "desktop"})
+    units = build_units(["a", "b", "c", "d"], 2)
+    assert sorted(n for nodeids in units.values() for n in nodeids) == ["a", "b", "c", "d"]
+
+
+def test_longest_unit_comes_first(history):
+    record(history, {"short": 1, "long": 20, "mid": 5}, {"short": "p1", "long": "p2", "mid": "p3"})
+    units = list(build_units(["short", "long", "mid"], 3).values())
+    assert units == [["long"], ["mid"], ["short"]]
+
+
+def test_same_profile_shares_a_unit(history):
+    record(history, {"a": 3, "b": 3, "c": 3, "x": 10}, {"a": "mobile", "b": "mobile", "c": "mobile", "x": "wide"})
+    units = build_units(["a", "b", "c", "x"], 1)
+    assert sorted(map(sorted, units.values())) == [["a", "b", "c"], ["x"]]
+
+
+def test_large_profile_is_split_to_keep_balance(history):
+    nodeids = [f"t{i}" for i in range(8)]
+    record(history, {n: 2 for n in nodeids}, {n: "mobile" for n in nodeids})
+    units = build_units(nodeids, 2)
+    # Capacity is half a worker's fair share: 16s / (2 workers * 2) = 4s
+    assert len(units) == 4
+    assert all(len(nodeids) == 2 for nodeids in units.values())
+
+
+def test_empty_history_uses_the_default_duration(history):
+    units = build_units(["a", "b"], 2)
+    assert sorted(n for nodeids in units.values() for n in nodeids) == ["a", "b"]
+
+
+def test_single_long_test_gets_its_own_unit(history):
+    record(history, {"huge": 100, "a": 1, "b": 1}, {"huge": "p", "a": "p", "b": "p"})
+    units = list(build_units(["huge", "a", "b"], 4).values())
+    assert units[0] == ["huge"]
+
+
+def test_ties_are_ordered_by_unit_name(history):
+    record(history, {"a": 3, "b": 3}, {"a": "p2", "b": "p1"})
+    units = build_units(["a", "b"], 2)
+    assert list(units.items()) == [("p1#1", ["b"]), ("p2#0", ["a"])]
+    assert build_units(["a", "b"], 2) == units
@@ -0,0 +1,86 @@
+"""
+Unit tests: latency histogram and keep-alive connection pool of the load generator
+"""
+import asyncio
+import json
+import pytest
+from utils.http_load import ConnectionPool, LatencyHistogram
+from utils.standin_server import StandInServer
+
+pytestmark = pytest.mark.unit
+
+
+def test_empty_histogram_has_no_percentiles():
+    histogram = LatencyHistogram(significant_digits=2)
+    assert histogram.percentile(50) is None
+    assert histogram.count == 0
+
+
+def test_single_sample_is_every_percentile():
+    histogram = LatencyHistogram(significant_digits=2)
+    histogram.record(0.000150)
+    assert histogram.percentile(0) == histogram.percentile(100) == 0.000150
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram(significant_digits=2)
+    for micros in range(1, 101):
+        histogram.record(micros / 1_000_000)
+    assert histogram.percentile(50) == 0.000050
+    assert histogram.percentile(99) == 0.000099
+
+
+def test_percentiles_stay_within_the_precision():
+    histogram = LatencyHistogram(significant_digits=2)
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+    for q, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        assert histogram.percentile(q) == pytest.approx(expected, rel=0.01)
+
+
+def test_merge_adds_counts_and_range():
+    first, second = LatencyHistogram(significant_digits=2), LatencyHistogram(significant_digits=2)
+    first.record(0.000010)
+    second.record(0.000090)
+    second.record(0.000050)
+    first.merge(second)
+    first.merge(LatencyHistogram(significant_digits=2))
+    assert (first.count, first.min, first.max) == (3, 10, 90)
+    assert first.percentile(50) == 0.000050
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+def test_pool_reuses_keep_alive_connections(server):
+    async def run():
+        pool = ConnectionPool(server.url, size=2)
+        try:
+            results = [await pool.request("GET", "/rest/products/search?q=apple") for _ in range(5)]
+        finally:
+            pool.close()
+        return pool.opened, results
+
+    opened, results = asyncio.run(run())
+    assert opened == 1
+    status, body = results[-1]
+    names = [product["name"] for product in json.loads(body)["data"]]
+    assert status == 200
+    assert names == ["Apple Juice (1000ml)", "Apple Pomace"]
+
+
+def test_pool_never_exceeds_its_size(server):
+    async def run():
+        pool = ConnectionPool(server.url, size=2)
+        try:
+            statuses = await asyncio.gather(*(pool.request("GET", "/rest/products/search?q=") for _ in range(10)))
+        finally:
+            pool.close()
+        return pool.opened, statuses
+
+    opened, statuses = asyncio.run(run())
+    assert opened <= 2
+    assert [status for status, _ in statuses] == [200] * 10
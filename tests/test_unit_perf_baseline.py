@@ -0,0 +1,89 @@
+"""
+Unit tests: Mann-Whitney regression test and the rolling SQLite baseline
+"""
+import pytest
+from utils.perf_baseline import PerfBaseline, Regression, mann_whitney_greater
+
+pytestmark = pytest.mark.unit
+
+FAST = [1.0 + i * 0.01 for i in range(12)]
+SLOW = [2.0 + i * 0.01 for i in range(12)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PerfBaseline(path=str(tmp_path / "perf" / "baseline.sqlite"), runner="unit")
+
+
+def test_clearly_slower_samples_are_significant():
+    u, p_value = mann_whitney_greater(SLOW, FAST)
+    assert u == len(SLOW) * len(FAST)
+    assert p_value < 0.001
+
+
+def test_faster_samples_are_not_significant():
+    _, p_value = mann_whitney_greater(FAST, SLOW)
+    assert p_value > 0.99
+
+
+def test_all_ties_give_no_evidence():
+    assert mann_whitney_greater([1.0] * 5, [1.0] * 5) == (12.5, 1.0)
+
+
+def test_single_samples():
+    assert mann_whitney_greater([2.0], [1.0]) == (1.0, 0.5)
+    assert mann_whitney_greater([1.0], [1.0]) == (0.5, 1.0)
+
+
+def test_zero_baseline_median_is_an_infinite_slowdown():
+    assert Regression("s", "cold", 0.0, 1.0, 0.0, 1).delta_pct == float("inf")
+
+
+def test_empty_store_has_no_baseline(store):
+    assert store.baseline("home", "cold") == ([], 0)
+    assert store.check("home", "cold", SLOW) is None
+
+
+def test_baseline_too_small_gives_no_verdict(store):
+    store.record("home", "cold", FAST[:5], "b1", "t1")
+    assert store.check("home", "cold", SLOW) is None
+
+
+def test_regression_is_reported(store):
+    store.record("home", "cold", FAST, "b1", "t1")
+    regression = store.check("home", "cold", SLOW)
+    assert regression is not None
+    assert regression.baseline_runs == 1
+    assert regression.delta_pct > 90
+
+
+def test_small_slowdown_is_ignored(store):
+    store.record("home", "cold", FAST, "b1", "t1")
+    assert store.check("home", "cold", [v * 1.05 for v in FAST]) is None
+
+
+def test_regressed_runs_stay_out_of_the_baseline(store):
+    store.record("home", "cold", FAST, "b1", "t1")
+    store.record("home", "cold", SLOW, "b2", "t2", regressed=True)
+    assert store.baseline("home", "cold") == (FAST, 1)
+
+
+def test_accepted_run_starts_a_new_baseline(store):
+    store.record("home", "cold", FAST, "b1", "t1")
+    store.record("home", "cold", SLOW, "b2", "t2", accepted=True)
+    assert store.baseline("home", "cold") == (SLOW, 1)
+    assert store.check("home", "cold", SLOW) is None
+
+
+def test_baseline_is_kept_per_mode_and_profile(store):
+    store.record("home", "cold", FAST, "b1", "t1")
+    store.record("home", "cold", SLOW, "b1", "t1", profile="3g")
+    assert store.baseline("home", "warm") == ([], 0)
+    assert store.baseline("home", "cold", profile="3g") == (SLOW, 1)
+
+
+def test_baseline_rolls_over_the_last_runs(store):
+    for run in range(5):
+        store.record("home", "cold", [float(run)], f"b{run}", f"t{run}")
+    samples, runs = store.baseline("home", "cold", runs=3)
+    assert (sorted(samples), runs) == ([2.0, 3.0, 4.0], 3)
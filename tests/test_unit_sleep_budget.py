@@ -0,0 +1,35 @@
+"""
+Unit tests: sleep budget attribution
+"""
+import os
+import pytest
+from config.config import Config
+from utils.sleep_budget import SleepBudget
+
+pytestmark = pytest.mark.unit
+
+
+def test_project_sleeps_are_attributed():
+    assert SleepBudget()._is_project_file(os.path.join(Config.BASE_DIR, "pages", "home_page.py"))
+
+
+def test_lock_backoff_is_not_a_fixed_sleep():
+    assert not SleepBudget()._is_project_file(os.path.join(Config.BASE_DIR, "utils", "file_lock.py"))
+
+
+def test_third_party_and_generated_code_are_ignored():
+    budget = SleepBudget()
+    assert not budget._is_project_file("<string>")
+    assert not budget._is_project_file(os.path.join(Config.BASE_DIR, "venv", "site-packages", "x.py"))
+
+
+def test_totals_per_test_and_run():
+    budget = SleepBudget()
+    budget.start_test("a")
+    budget.record(1.5, "pages/x.py:1")
+    budget.record(0.5, "pages/x.py:2")
+    budget.end_test()
+    budget.record(2, "utils/y.py:3")
+    assert budget.total("a") == 2.0
+    assert budget.total("<outside tests>") == 2
+    assert budget.total() == 4.0
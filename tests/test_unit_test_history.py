@@ -0,0 +1,96 @@
+"""
+Unit tests: test history (durations, quarantine, shard partitioning)
+"""
+import argparse
+import pytest
+from utils.test_history import TestHistory, parse_shard
+
+pytestmark = pytest.mark.unit
+
+
+def make_history(tmp_path, durations=None):
+    """History file with the given {nodeid: [durations]}"""
+    history = TestHistory(path=str(tmp_path / "history.json"))
+    entries = [{"nodeid": nodeid, "outcome": "passed", "duration": d}
+               for nodeid, values in (durations or {}).items() for d in values]
+    if entries:
+        history.update(entries)
+    return history
+
+
+def shard_totals(history, suites, count):
+    """Per-shard total duration when each suite is split on its own, as run_all_tests does"""
+    totals = [0.0] * count
+    for offset, nodeids in enumerate(suites):
+        default = history.default_duration()
+        for index, shard in enumerate(history.partition(nodeids, count, offset)):
+            totals[index] += sum(history.duration(n, default) for n in shard)
+    return totals
+
+
+class TestPartition:
+
+    def test_every_test_lands_in_exactly_one_shard(self, tmp_path):
+        history = make_history(tmp_path, {"a": [5], "b": [3], "c": [2], "d": [1]})
+        shards = history.partition(["a", "b", "c", "d", "e"], 3)
+        assert sorted(n for shard in shards for n in shard) == ["a", "b", "c", "d", "e"]
+
+    def test_longest_first_balances_known_durations(self, tmp_path):
+        history = make_history(tmp_path, {"a": [8], "b": [7], "c": [5], "d": [4], "e": [3], "f": [3]})
+        shards = history.partition(list("abcdef"), 2)
+        totals = [sum(history.duration(n) for n in shard) for shard in shards]
+        assert totals == [15, 15]
+
+    def test_empty_history_splits_evenly_by_count(self, tmp_path):
+        history = make_history(tmp_path)
+        shards = history.partition([f"t{i}" for i in range(7)], 3)
+        assert sorted(len(shard) for shard in shards) == [2, 2, 3]
+
+    def test_no_tests_gives_empty_shards(self, tmp_path):
+        assert make_history(tmp_path).partition([], 2) == [[], []]
+
+    def test_offset_rotates_the_tie_break(self, tmp_path):
+        history = make_history(tmp_path)
+        assert history.partition(["a", "b", "c"], 2, offset=0)[0] == ["a", "c"]
+        assert history.partition(["a", "b", "c"], 2, offset=1)[1] == ["a", "c"]
+
+    def test_shard_totals_stay_balanced_across_suites(self, tmp_path):
+        # Four suites of five unknown (equal) tests: without rotation shard 1 gets every leftover
+        history = make_history(tmp_path)
+        suites = [[f"suite{s}::t{i}" for i in range(5)] for s in range(4)]
+        totals = shard_totals(history, suites, 2)
+        assert max(totals) - min(totals) <= history.default_duration()
+
+    def test_split_is_deterministic(self, tmp_path):
+        history = make_history(tmp_path, {"a": [2], "b": [2], "c": [1]})
+        assert history.partition(["c", "b", "a"], 2) == history.partition(["a", "b", "c"], 2)
+
+
+class TestDurations:
+
+    def test_median_of_recent_samples(self, tmp_path):
+        history = make_history(tmp_path, {"a": [1, 9, 3]})
+        assert history.duration("a") == 3
+
+    def test_unknown_test_uses_default(self, tmp_path):
+        history = make_history(tmp_path, {"a": [4], "b": [6]})
+        assert history.duration("zz") is None
+        assert history.duration("zz", history.default_duration()) == 5
+
+    def test_skipped_runs_are_not_recorded(self, tmp_path):
+        history = make_history(tmp_path)
+        history.update([{"nodeid": "a", "outcome": "skipped", "duration": 0.0}])
+        assert history.duration("a") is None
+
+    def test_digest_changes_with_contents(self, tmp_path):
+        history = make_history(tmp_path, {"a": [1]})
+        before = history.digest()
+        history.update([{"nodeid": "a", "outcome": "passed", "duration": 2}])
+        assert history.digest() != before
+
+
+def test_parse_shard():
+    assert parse_shard("2/3") == (2, 3)
+    for value in ("0/2", "3/2", "x"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
@@ -0,0 +1,98 @@
+"""
+API-based authentication
+Logs in through the app's REST endpoint once per worker and injects the
+session into the browser, so tests can start already authenticated
+"""
+import base64
+import json
+import threading
+import time
+import requests
+from config.config import Config
+from utils.client_state import client_state
+
+
+class ApiAuthSession:
+    """Caches REST login tokens per user until shortly before they expire"""
+
+    def __init__(self, api_url=Config.API_URL):
+        self.api_url = api_url.rstrip("/")
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._http = requests.Session()
+
+    def get_auth(self, email=Config.VALID_EMAIL, password=Config.VALID_PASSWORD):
+        """
+        Get a valid authentication for a user, logging in only when needed
+
+        Returns:
+            dict with token, bid (basket id), email and expires_at (epoch seconds)
+        """
+        with self._lock:
+            auth = self._cache.get(email)
+            if auth and auth["expires_at"] - time.time() > Config.AUTH_TOKEN_REFRESH_MARGIN:
+                return auth
+            auth = self._login(email, password)
+            self._cache[email] = auth
+            return auth
+
+    def inject(self, driver, auth):
+        """Seed token cookie, localStorage token and basket id before the app boots"""
+        client_state.seed(
+            driver,
+            cookies={"token": auth["token"]},
+            local_storage={"token": auth["token"]},
+            session_storage={"bid": str(auth["bid"])}
+        )
+
+    def _login(self, email, password, register_if_missing=True):
+        response = self._http.post(
+            f"{self.api_url}/rest/user/login",
+            json={"email": email, "password": password},
+            timeout=Config.API_TIMEOUT
+        )
+        if response.status_code == 401 and register_if_missing and Config.API_REGISTER_TEST_USER:
+            # Fresh or reset instance of our own: create the test user, then retry once
+            self._register(email, password)
+            return self._login(email, password, register_if_missing=False)
+        response.raise_for_status()
+
+        authentication = response.json()["authentication"]
+        token = authentication["token"]
+        print(f"🔑 Logged in via API as {email}")
+        return {
+            "token": token,
+            "bid": authentication.get("bid"),
+            "email": authentication.get("umail", email),
+            "expires_at": self._token_expiry(token)
+        }
+
+    def _register(self, email, password):
+        response = self._http.post(
+            f"{self.api_url}/api/Users/",
+            json={
+                "email": email,
+                "password": password,
+                "passwordRepeat": password,
+                "securityQuestion": {"id": 1},
+                "securityAnswer": "automation"
+            },
+            timeout=Config.API_TIMEOUT
+        )
+        if response.status_code not in (200, 201, 400):  # 400: already registered
+            response.raise_for_status()
+
+    @staticmethod
+    def _token_expiry(token):
+        """Expiry from the JWT exp claim, or a configured TTL if the token has none"""
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+            return float(claims["exp"])
+        except (IndexError, KeyError, ValueError):
+            return time.time() + Config.AUTH_TOKEN_TTL
+
+
+# Global API auth session instance (one per pytest-xdist worker process)
+api_auth = ApiAuthSession()
@@ -0,0 +1,212 @@
+"""
+Concurrent browser load generator
+Runs the open -> search -> count journey in N headless browsers at once,
+with ramp-up, steady-state and ramp-down phases
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+from config.config import Config
+from pages.home_page import HomePage
+from utils.client_state import client_state
+from utils.helpers import get_driver
+from utils.perf_harness import percentile
+from utils.resources import max_browser_slots
+
+
+@dataclass
+class JourneySample:
+    """One virtual user journey"""
+    user: int
+    started: float  # Seconds since the load test started
+    latency: float  # Whole journey, seconds
+    open_time: Optional[float] = None
+    search_time: Optional[float] = None
+    count_time: Optional[float] = None
+    products: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BrowserLoadGenerator:
+    """Virtual users, one headless browser each"""
+
+    def __init__(self, users=Config.LOAD_USERS, ramp_up=Config.LOAD_RAMP_UP, steady=Config.LOAD_STEADY,
+                 ramp_down=Config.LOAD_RAMP_DOWN, think_time=Config.LOAD_THINK_TIME,
+                 search_terms=Config.LOAD_SEARCH_TERMS):
+        capacity = max_browser_slots()
+        if users > capacity:
+            print(f"⚠️ {users} browsers requested, this host holds {capacity}: capping")
+        self.users = max(1, min(users, capacity))
+        self.ramp_up = ramp_up
+        self.steady = steady
+        self.ramp_down = ramp_down
+        self.think_time = think_time
+        self.search_terms = search_terms
+        self.samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start = None
+
+    @property
+    def duration(self):
+        return self.ramp_up + self.steady + self.ramp_down
+
+    def schedule(self, user):
+        """
+        (join, leave) offsets of a virtual user
+
+        Users join evenly over the ramp-up and leave in reverse order over
+        the ramp-down, so all of them are active during the steady phase.
+        """
+        join = self.ramp_up * user / self.users
+        leave = self.ramp_up + self.steady + self.ramp_down * (self.users - user) / self.users
+        return join, leave
+
+    def run(self):
+        """
+        Run the load test
+
+        Returns:
+            LoadReport
+        """
+        print(f"🚦 Browser load: {self.users} users, ramp-up {self.ramp_up}s, "
+              f"steady {self.steady}s, ramp-down {self.ramp_down}s")
+        self._start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.users) as executor:
+            futures = [executor.submit(self._virtual_user, user) for user in range(self.users)]
+            for future in futures:
+                future.result()
+        return LoadReport.from_samples(self.samples, self.users, self.duration,
+                                       {"ramp_up": self.ramp_up, "steady": self.steady, "ramp_down": self.ramp_down})
+
+    def stop(self):
+        self._stop.set()
+
+    def _elapsed(self):
+        return time.monotonic() - self._start
+
+    def _virtual_user(self, user):
+        join, leave = self.schedule(user)
+        if self._stop.wait(join):
+            return
+
+        driver = None
+        try:
+            driver = get_driver(Config.DEFAULT_BROWSER, headless=True)
+            client_state.seed_consent(driver)
+        except Exception as e:
+            self._record(JourneySample(user, self._elapsed(), 0.0, error=f"browser start: {e.__class__.__name__}"))
+            if driver is not None:
+                driver.quit()
+            return
+
+        iteration = 0
+        try:
+            while self._elapsed() < leave and not self._stop.is_set():
+                term = self.search_terms[(user + iteration) % len(self.search_terms)]
+                self._record(self._journey(driver, user, term))
+                iteration += 1
+                if self._stop.wait(self.think_time):
+                    break
+        finally:
+            driver.quit()
+
+    def _journey(self, driver, user, term):
+        page = HomePage(driver)
+        sample = JourneySample(user, self._elapsed(), 0.0)
+        start = step = time.perf_counter()
+        try:
+            page.open()
+            sample.open_time, step = time.perf_counter() - step, time.perf_counter()
+            searched = page.search_product(term)
+            sample.search_time, step = time.perf_counter() - step, time.perf_counter()
+            if not searched:
+                sample.error = f"search for '{term}' failed"
+            else:
+                # The page objects swallow failures: no results under load is an error, not a pass
+                sample.products = page.get_product_count()
+                sample.count_time = time.perf_counter() - step
+                if not sample.products:
+                    sample.error = f"no products found for '{term}'"
+        except Exception as e:
+            sample.error = f"{e.__class__.__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        sample.latency = time.perf_counter() - start
+        return sample
+
+    def _record(self, sample):
+        with self._lock:
+            self.samples.append(sample)
+
+
+@dataclass
+class LoadReport:
+    """Throughput, latency percentiles and error rate, overall and over time"""
+    users: int
+    duration: float
+    phases: dict
+    journeys: int
+    errors: int
+    error_rate: float
+    throughput: float  # Journeys per second over the whole run
+    latency: dict  # p50/p90/p99/max of successful journeys, seconds
+    timeline: list  # One entry per LOAD_BUCKET_SECONDS window
+    samples: list
+
+    @classmethod
+    def from_samples(cls, samples, users, duration, phases, bucket=Config.LOAD_BUCKET_SECONDS):
+        samples = sorted(samples, key=lambda s: s.started)
+        errors = sum(1 for s in samples if s.error)
+        timeline = []
+        for start in range(0, int(duration) + 1, bucket):
+            window = [s for s in samples if start <= s.started < start + bucket]
+            if window:
+                timeline.append(dict(start=start, journeys=len(window), throughput=len(window) / bucket,
+                                     error_rate=sum(1 for s in window if s.error) / len(window),
+                                     active_users=len({s.user for s in window}),
+                                     latency=_latency([s.latency for s in window if not s.error])))
+        return cls(
+            users=users,
+            duration=duration,
+            phases=phases,
+            journeys=len(samples),
+            errors=errors,
+            error_rate=errors / len(samples) if samples else 0.0,
+            throughput=len(samples) / duration if duration else 0.0,
+            latency=_latency([s.latency for s in samples if not s.error]),
+            timeline=timeline,
+            samples=[asdict(s) for s in samples]
+        )
+
+    def save(self, directory=Config.LOAD_REPORTS_DIR):
+        """Write the report as JSON, returns the path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"browser_load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+        return path
+
+    def summary(self):
+        lines = [f"{self.journeys} journeys by {self.users} users in {self.duration:.0f}s: "
+                 f"{self.throughput:.2f}/s, error rate {self.error_rate:.1%}, latency {_format(self.latency)}"]
+        for bucket in self.timeline:
+            lines.append(f"  t+{bucket['start']:>4}s  users {bucket['active_users']:>3}  "
+                         f"{bucket['throughput']:.2f}/s  errors {bucket['error_rate']:.0%}  {_format(bucket['latency'])}")
+        return "\n".join(lines)
+
+
+def _latency(values):
+    if not values:
+        return {}
+    return {"p50": percentile(values, 50), "p90": percentile(values, 90),
+            "p99": percentile(values, 99), "max": max(values)}
+
+
+def _format(latency):
+    if not latency:
+        return "n/a"
+    return " ".join(f"{name}={value:.2f}s" for name, value in latency.items())
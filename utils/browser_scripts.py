@@ -0,0 +1,267 @@
+"""
+JavaScript snippets injected into the application under test
+"""
+
+# Counts in-flight fetch/XHR requests in window.__qaNet. Idempotent, so it can be
+# registered on every new document and also injected lazily. socket.io long-polling
+# is ignored because it is always in flight.
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__qaNet) { return; }
+    var net = window.__qaNet = {inflight: 0, lastChange: performance.now()};
+    function tracked(url) { return String(url || '').indexOf('socket.io') === -1; }
+    function begin() { net.inflight++; net.lastChange = performance.now(); }
+    function end() { net.inflight = Math.max(0, net.inflight - 1); net.lastChange = performance.now(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function (input) {
+            var url = typeof input === 'string' ? input : (input && input.url);
+            if (!tracked(url)) { return originalFetch.apply(this, arguments); }
+            begin();
+            return originalFetch.apply(this, arguments).then(
+                function (r) { end(); return r; },
+                function (e) { end(); throw e; });
+        };
+    }
+
+    var originalOpen = XMLHttpRequest.prototype.open;
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__qaTracked = tracked(url);
+        return originalOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        if (this.__qaTracked) {
+            begin();
+            this.addEventListener('loadend', end, {once: true});
+        }
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# Async script: resolves once Angular is stable, no tracked request is in flight
+# and the DOM has been quiet for quietMs. Arguments: timeoutMs, quietMs, callback.
+WAIT_FOR_APP_IDLE_JS = NETWORK_TRACKER_JS + """
+var timeoutMs = arguments[0], quietMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), lastMutation = start;
+var satisfiedAt = {angular: null, network: null, dom: null};
+var observer = new MutationObserver(function () { lastMutation = performance.now(); });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+function angularStable() {
+    if (typeof window.getAllAngularTestabilities !== 'function') { return true; }
+    return window.getAllAngularTestabilities().every(function (t) { return t.isStable(); });
+}
+
+function check() {
+    var now = performance.now(), net = window.__qaNet;
+    var state = {
+        angular: angularStable(),
+        network: net.inflight === 0 && now - net.lastChange >= quietMs,
+        dom: now - lastMutation >= quietMs
+    };
+    Object.keys(state).forEach(function (k) {
+        if (!state[k]) { satisfiedAt[k] = null; }
+        else if (satisfiedAt[k] === null) { satisfiedAt[k] = now; }
+    });
+    var idle = state.angular && state.network && state.dom;
+    if (idle || now - start >= timeoutMs) {
+        observer.disconnect();
+        var last = null;
+        Object.keys(satisfiedAt).forEach(function (k) {
+            if (satisfiedAt[k] !== null && (last === null || satisfiedAt[k] >= satisfiedAt[last])) { last = k; }
+        });
+        var pending = Object.keys(state).filter(function (k) { return !state[k]; });
+        done({idle: idle, lastSignal: idle ? last : null, pending: pending,
+              inflight: net.inflight, elapsedMs: Math.round(now - start)});
+        return;
+    }
+    setTimeout(check, 50);
+}
+check();
+"""
+
+# Evaluates a batch of locators in one call. Argument: list of
+# {name, kind: "css"|"xpath", expr}. Returns {name: {present, visible, count, text}}.
+QUERY_ELEMENTS_JS = """
+var specs = arguments[0], result = {};
+
+function isVisible(el) {
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') { return false; }
+    return el.getClientRects().length > 0;
+}
+
+specs.forEach(function (spec) {
+    var elements = [];
+    try {
+        if (spec.kind === 'xpath') {
+            var snapshot = document.evaluate(spec.expr, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snapshot.snapshotLength; i++) { elements.push(snapshot.snapshotItem(i)); }
+        } else {
+            elements = Array.prototype.slice.call(document.querySelectorAll(spec.expr));
+        }
+    } catch (e) {
+        result[spec.name] = {present: false, visible: false, count: 0, text: null, error: String(e)};
+        return;
+    }
+    var visible = elements.filter(function (el) { return el.nodeType === 1 && isVisible(el); });
+    var first = visible[0] || elements[0];
+    result[spec.name] = {
+        present: elements.length > 0,
+        visible: visible.length > 0,
+        count: elements.length,
+        text: first ? String(first.innerText || first.textContent || '').trim().slice(0, 200) : null
+    };
+});
+return result;
+"""
+
+# Synchronous snapshot: document loaded, no tracked request in flight, Angular stable
+DOM_SETTLED_JS = """
+if (document.readyState !== 'complete') { return false; }
+if (window.__qaNet && window.__qaNet.inflight > 0) { return false; }
+if (typeof window.getAllAngularTestabilities === 'function') {
+    return window.getAllAngularTestabilities().every(function (t) { return t.isStable(); });
+}
+return true;
+"""
+
+# Async script: waits for the navigation entry's loadEventEnd, lets LCP settle for
+# settleMs, then returns the Navigation Timing L2 entry plus paint, LCP and CLS.
+# Buffered observers pick up entries recorded before the script ran.
+# Arguments: timeoutMs, settleMs, callback. Times are ms relative to the navigation.
+PAGE_PERFORMANCE_JS = """
+var timeoutMs = arguments[0], settleMs = arguments[1], done = arguments[arguments.length - 1];
+var started = performance.now(), lcp = null, paints = {}, observers = [];
+var cls = 0, sessionValue = 0, sessionStart = 0, sessionLast = 0;
+
+function observe(type, handler) {
+    try {
+        var observer = new PerformanceObserver(function (list) { list.getEntries().forEach(handler); });
+        observer.observe({type: type, buffered: true});
+        observers.push({observer: observer, handler: handler});
+    } catch (e) { /* entry type not supported by this browser */ }
+}
+observe('paint', function (e) { paints[e.name] = e.startTime; });
+observe('largest-contentful-paint', function (e) { lcp = e.renderTime || e.loadTime || e.startTime; });
+observe('layout-shift', function (e) {
+    if (e.hadRecentInput) { return; }
+    // CLS = largest session window (gaps < 1s, window <= 5s)
+    if (sessionValue && e.startTime - sessionLast < 1000 && e.startTime - sessionStart < 5000) {
+        sessionValue += e.value;
+    } else {
+        sessionValue = e.value;
+        sessionStart = e.startTime;
+    }
+    sessionLast = e.startTime;
+    cls = Math.max(cls, sessionValue);
+});
+
+function navigation() {
+    var entries = performance.getEntriesByType('navigation');
+    return entries.length ? entries[0] : null;
+}
+
+function finish(complete) {
+    observers.forEach(function (o) { o.observer.takeRecords().forEach(o.handler); o.observer.disconnect(); });
+    var nav = navigation();
+    done({
+        complete: complete,
+        navigation: nav ? nav.toJSON() : null,
+        firstPaint: paints['first-paint'] === undefined ? null : paints['first-paint'],
+        firstContentfulPaint: paints['first-contentful-paint'] === undefined ? null : paints['first-contentful-paint'],
+        largestContentfulPaint: lcp,
+        cumulativeLayoutShift: cls,
+        waitedMs: performance.now() - started
+    });
+}
+
+(function poll() {
+    var nav = navigation();
+    if (nav && nav.loadEventEnd > 0) {
+        setTimeout(function () { finish(true); }, settleMs);
+    } else if (performance.now() - started >= timeoutMs) {
+        finish(false);
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+# Arms a search timeline in window.__qaSearch before Enter is pressed: the Enter
+# keydown (event.timeStamp), the first search API call after it (Resource Timing,
+# observed so a full resource buffer does not hide it) and every results grid
+# mutation. All times share the page's performance.now() clock.
+# Arguments: apiPath (URL substring), gridSelector (CSS).
+SEARCH_LATENCY_JS = """
+var apiPath = arguments[0], gridSelector = arguments[1];
+if (window.__qaSearch) { window.__qaSearch.disarm(); }
+var s = window.__qaSearch = {keydown: null, request: null, response: null, url: null, mutations: []};
+
+function onKey(event) {
+    if (s.keydown === null && event.key === 'Enter') { s.keydown = event.timeStamp; }
+}
+function onResources(list) {
+    list.getEntries().forEach(function (entry) {
+        if (s.response === null && s.keydown !== null && entry.startTime >= s.keydown
+                && entry.name.indexOf(apiPath) !== -1) {
+            s.request = entry.startTime;
+            s.response = entry.responseEnd;
+            s.url = entry.name;
+        }
+    });
+}
+function isGrid(node) {
+    return node.nodeType === 1 && (node.matches(gridSelector) || node.querySelector(gridSelector) !== null);
+}
+function touchesGrid(m) {
+    var target = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+    if (target && target.closest(gridSelector) !== null) { return true; }
+    return Array.prototype.some.call(m.addedNodes, isGrid) || Array.prototype.some.call(m.removedNodes, isGrid);
+}
+
+var resources = new PerformanceObserver(onResources);
+resources.observe({type: 'resource'});
+var grid = new MutationObserver(function (records) {
+    var now = performance.now();
+    if (s.keydown !== null && s.mutations.length < 1000 && records.some(touchesGrid)) { s.mutations.push(now); }
+});
+grid.observe(document, {childList: true, subtree: true, characterData: true});
+document.addEventListener('keydown', onKey, true);
+
+s.disarm = function () {
+    onResources({getEntries: function () { return resources.takeRecords(); }});
+    resources.disconnect();
+    grid.disconnect();
+    document.removeEventListener('keydown', onKey, true);
+};
+
+// Resolves once a grid mutation follows the API response, once the grid changed
+// with nothing in flight graceMs after Enter (results served client-side), or on timeout
+s.collect = function (timeoutMs, graceMs, done) {
+    var started = performance.now();
+    (function poll() {
+        onResources({getEntries: function () { return resources.takeRecords(); }});
+        var now = performance.now();
+        var render = s.response === null ? null
+            : s.mutations.filter(function (t) { return t >= s.response; })[0] || null;
+        var clientSide = s.response === null && s.mutations.length > 0 && s.keydown !== null
+            && now - s.keydown >= graceMs && !(window.__qaNet && window.__qaNet.inflight > 0);
+        if (render !== null || clientSide || now - started >= timeoutMs) {
+            s.disarm();
+            done({keydown: s.keydown, request: s.request, response: s.response, url: s.url,
+                  firstMutation: s.mutations.length ? s.mutations[0] : null, render: render});
+            return;
+        }
+        setTimeout(poll, 20);
+    })();
+};
+"""
+
+# Async: waits for the armed search timeline. Arguments: timeoutMs, graceMs, callback.
+SEARCH_LATENCY_RESULT_JS = """
+window.__qaSearch.collect(arguments[0], arguments[1], arguments[arguments.length - 1]);
+"""
@@ -14,9 +14,11 @@ class BugReporter:
     def __init__(self):
         self.bugs = []
         self.bug_counter = 1
+        # Suites (TEST_RUN_TAG) and xdist workers start in the same second: keep their files apart
+        tag = "_".join(p for p in (os.environ.get("TEST_RUN_TAG"), os.environ.get("PYTEST_XDIST_WORKER")) if p)
         self.report_file = os.path.join(
             Config.BUGS_DIR, 
-            f"bug_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            f"bug_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{tag or os.getpid()}.md"
         )
     
     def log_bug(self, test_name, error_message, severity="MEDIUM", screenshot_path=None):
@@ -32,6 +34,13 @@ class BugReporter:
         self.bugs.append(bug)
         self.bug_counter += 1
         print(f"🐛 Bug logged: {bug['id']} - {test_name}")
+        return bug
+    
+    def import_bugs(self, bugs):
+        """Add bug entries logged elsewhere (e.g. other shards), renumbering their ids"""
+        for bug in bugs:
+            self.bugs.append(dict(bug, id=f"BUG-{self.bug_counter:03d}"))
+            self.bug_counter += 1
     
     def generate_report(self):
         """Generate markdown bug report"""
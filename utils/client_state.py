@@ -0,0 +1,99 @@
+"""
+Client-side state seeding
+Puts cookies and web storage entries in place before the app's first render,
+e.g. to pre-accept the welcome banner and cookie notice or to log a user in
+"""
+import json
+from urllib.parse import urlsplit
+from config.config import Config
+
+
+SEED_SCRIPT_TEMPLATE = """
+(function () {
+    if (location.origin !== %(origin)s) { return; }
+    var cookies = %(cookies)s, storage = %(local_storage)s, session = %(session_storage)s;
+    Object.keys(cookies).forEach(function (name) {
+        if (document.cookie.split('; ').indexOf(name + '=' + encodeURIComponent(cookies[name])) === -1) {
+            document.cookie = name + '=' + encodeURIComponent(cookies[name]) + '; path=/';
+        }
+    });
+    Object.keys(storage).forEach(function (key) {
+        try { window.localStorage.setItem(key, storage[key]); } catch (e) {}
+    });
+    Object.keys(session).forEach(function (key) {
+        try { window.sessionStorage.setItem(key, session[key]); } catch (e) {}
+    });
+})();
+"""
+
+
+def get_app_origin(url=Config.BASE_URL):
+    """scheme://host[:port] of the application under test"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ClientStateSeeder:
+    """Seeds and un-seeds client state on a WebDriver session"""
+
+    def seed(self, driver, cookies=None, local_storage=None, session_storage=None):
+        """
+        Make cookies / web storage entries exist before the app boots
+
+        Chrome registers a script that runs on every new document of the app
+        origin (Page.addScriptToEvaluateOnNewDocument). Other browsers get the
+        values set once through a lightweight page on the app origin.
+
+        Args:
+            driver: WebDriver instance
+            cookies: dict of cookie name -> value
+            local_storage: dict of localStorage key -> value
+            session_storage: dict of sessionStorage key -> value
+        """
+        cookies = cookies or {}
+        local_storage = local_storage or {}
+        session_storage = session_storage or {}
+        origin = get_app_origin()
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            source = SEED_SCRIPT_TEMPLATE % {
+                "origin": json.dumps(origin),
+                "cookies": json.dumps(cookies),
+                "local_storage": json.dumps(local_storage),
+                "session_storage": json.dumps(session_storage),
+            }
+            result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+            driver.__dict__.setdefault("_seed_script_ids", []).append(result["identifier"])
+        else:
+            driver.get(origin + Config.SEED_BOOTSTRAP_PATH)
+            for name, value in cookies.items():
+                driver.add_cookie({"name": name, "value": value, "path": "/"})
+            for key, value in local_storage.items():
+                driver.execute_script("window.localStorage.setItem(arguments[0], arguments[1]);", key, value)
+            for key, value in session_storage.items():
+                driver.execute_script("window.sessionStorage.setItem(arguments[0], arguments[1]);", key, value)
+
+        driver.__dict__.setdefault("_seeded_keys", set()).update(cookies, local_storage, session_storage)
+
+    def seed_consent(self, driver):
+        """Pre-dismiss the welcome banner and cookie notice"""
+        self.seed(driver, cookies=Config.CONSENT_COOKIES)
+
+    def is_seeded(self, driver, *keys):
+        """Check whether every given cookie/storage key has been seeded on this session"""
+        seeded = getattr(driver, "_seeded_keys", set())
+        return all(key in seeded for key in keys)
+
+    def clear(self, driver):
+        """Stop seeding new documents (values already set are cleared by the pool reset)"""
+        for identifier in getattr(driver, "_seed_script_ids", []):
+            try:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+            except Exception as e:
+                print(f"⚠️ Could not remove seed script: {e}")
+        driver.__dict__.pop("_seed_script_ids", None)
+        driver.__dict__.pop("_seeded_keys", None)
+
+
+# Global client state seeder instance
+client_state = ClientStateSeeder()
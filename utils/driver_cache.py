@@ -0,0 +1,180 @@
+"""
+Local chromedriver cache
+Resolves a chromedriver binary from a manifest keyed by Chrome major version,
+platform and architecture. After the first download it works fully offline.
+"""
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import zipfile
+from config.config import Config
+from utils.file_lock import FileLock
+
+
+CFT_MILESTONES_URL = ("https://googlechromelabs.github.io/chrome-for-testing/"
+                      "latest-versions-per-milestone-with-downloads.json")
+CFT_DOWNLOAD_URL = ("https://storage.googleapis.com/chrome-for-testing-public/"
+                    "{version}/{platform}/chromedriver-{platform}.zip")
+
+CHROME_BINARIES = {
+    "Linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+    "Darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+               "/Applications/Chromium.app/Contents/MacOS/Chromium"],
+}
+
+# Resolved paths for this process, keyed by the requested pin
+_resolved = {}
+
+
+def get_platform_key():
+    """Chrome for Testing platform name for this machine"""
+    system = platform.system()
+    machine = platform.machine().lower()
+    if system == "Windows":
+        return "win64" if machine.endswith("64") else "win32"
+    if system == "Darwin":
+        return "mac-arm64" if machine in ("arm64", "aarch64") else "mac-x64"
+    return "linux64"
+
+
+class ChromeDriverCache:
+    """File-locked chromedriver cache shared by all workers on a machine"""
+
+    def __init__(self, cache_dir=Config.DRIVER_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.platform = get_platform_key()
+
+    def resolve(self, version=Config.CHROMEDRIVER_VERSION):
+        """
+        Get the path of a chromedriver matching the installed Chrome
+
+        Args:
+            version: Pinned full chromedriver version, or None to follow Chrome
+
+        Returns:
+            Path to the chromedriver executable
+        """
+        if version in _resolved:
+            return _resolved[version]
+
+        manifest = self._read_manifest()
+        major = version.split(".")[0] if version else self._chrome_major(manifest)
+        key = f"{major}|{self.platform}"
+
+        entry = manifest.get("drivers", {}).get(key)
+        if entry and os.path.isfile(entry["path"]) and (not version or entry["version"] == version):
+            _resolved[version] = entry["path"]
+            return entry["path"]
+
+        # Slow path: one worker downloads, the others wait and reuse it
+        with FileLock(self.manifest_path):
+            manifest = self._read_manifest()
+            entry = manifest.get("drivers", {}).get(key)
+            if not (entry and os.path.isfile(entry["path"]) and (not version or entry["version"] == version)):
+                entry = self._download(major, version)
+                manifest.setdefault("drivers", {})[key] = entry
+                self._write_manifest(manifest)
+
+        _resolved[version] = entry["path"]
+        return entry["path"]
+
+    def _chrome_major(self, manifest):
+        """Installed Chrome major version, cached against the binary's mtime"""
+        chrome = manifest.get("chrome")
+        if chrome and chrome.get("path"):
+            try:
+                if os.stat(chrome["path"]).st_mtime == chrome["mtime"]:
+                    return chrome["major"]
+            except OSError:
+                pass
+
+        detected = self._detect_chrome()
+        if detected is None:
+            # No detectable browser: fall back to the newest cached driver
+            majors = [k.split("|")[0] for k in manifest.get("drivers", {}) if k.endswith("|" + self.platform)]
+            if majors:
+                return max(majors, key=int)
+            raise RuntimeError("Chrome version could not be detected and no chromedriver is cached; "
+                               "set Config.CHROMEDRIVER_VERSION to pin one")
+
+        path, major = detected
+        with FileLock(self.manifest_path):
+            manifest = self._read_manifest()
+            manifest["chrome"] = {"path": path, "mtime": os.stat(path).st_mtime if path else None, "major": major}
+            self._write_manifest(manifest)
+        return major
+
+    def _detect_chrome(self):
+        """Return (binary path, major version) of the installed Chrome or None"""
+        system = platform.system()
+        if system == "Windows":
+            try:
+                import winreg
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                    version = winreg.QueryValueEx(key, "version")[0]
+                return None, version.split(".")[0]
+            except OSError:
+                return None
+
+        for candidate in CHROME_BINARIES.get(system, CHROME_BINARIES["Linux"]):
+            path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+            if not path or not os.path.isfile(path):
+                continue
+            try:
+                output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+            except (OSError, subprocess.SubprocessError):
+                continue
+            match = re.search(r"(\d+)\.\d+\.\d+\.\d+", output)
+            if match:
+                return os.path.realpath(path), match.group(1)
+        return None
+
+    def _download(self, major, version=None):
+        """Download and unpack chromedriver into the cache"""
+        import requests
+
+        if not version:
+            response = requests.get(CFT_MILESTONES_URL, timeout=30)
+            response.raise_for_status()
+            milestone = response.json()["milestones"].get(str(major))
+            if milestone is None:
+                raise RuntimeError(f"No chromedriver published for Chrome {major}")
+            version = milestone["version"]
+
+        url = CFT_DOWNLOAD_URL.format(version=version, platform=self.platform)
+        print(f"Downloading ChromeDriver {version} for {self.platform}...")
+        response = requests.get(url, timeout=120)
+        response.raise_for_status()
+
+        target_dir = os.path.join(self.cache_dir, self.platform, version)
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            archive.extractall(target_dir)
+
+        binary = "chromedriver.exe" if self.platform.startswith("win") else "chromedriver"
+        path = os.path.join(target_dir, f"chromedriver-{self.platform}", binary)
+        os.chmod(path, 0o755)
+        print(f"ChromeDriver installed at: {path}")
+        return {"version": version, "path": path}
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+# Global chromedriver cache instance
+chromedriver_cache = ChromeDriverCache()
@@ -0,0 +1,121 @@
+"""
+WebDriver session pool
+Keeps browser sessions warm across tests and resets them in between
+"""
+import threading
+from config.config import Config
+from utils.helpers import get_driver
+from utils.client_state import client_state
+from utils.throttling import apply_throttling, clear_throttling
+
+
+class DriverPool:
+    """Hands out running WebDriver sessions and recycles them"""
+
+    def __init__(self, size=Config.DRIVER_POOL_SIZE, max_uses=Config.DRIVER_MAX_USES):
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = {}
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, browser=Config.DEFAULT_BROWSER, headless=Config.HEADLESS, resolution=None, throttling="none"):
+        """
+        Get a warm session, starting a new browser only when none is idle
+
+        Args:
+            browser: Browser name (chrome, firefox, edge)
+            headless: Run in headless mode
+            resolution: Tuple (width, height) for window size
+            throttling: Name of a Config.THROTTLING_PROFILES entry
+
+        Returns:
+            WebDriver instance
+        """
+        key = (browser.lower(), headless)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            driver = idle.pop() if idle else None
+
+        if driver is None:
+            driver = get_driver(browser, headless=headless, resolution=resolution, throttling=throttling)
+            driver._pool_key = key
+            with self._lock:
+                self._uses[id(driver)] = 0
+        else:
+            self._apply_window(driver, headless, resolution)
+            if throttling != "none":
+                apply_throttling(driver, throttling)
+
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver, failed=False):
+        """
+        Return a session to the pool after a test
+
+        Sessions are recycled (quit) after a failure, after max_uses tests
+        or when the pool for that browser is already full.
+        """
+        key = getattr(driver, "_pool_key", None)
+        with self._lock:
+            uses = self._uses.get(id(driver), self.max_uses)
+            idle = self._idle.setdefault(key, [])
+            keep = key is not None and not failed and uses < self.max_uses and len(idle) < self.size
+
+        if keep:
+            try:
+                self.reset(driver)
+            except Exception as e:
+                print(f"⚠️ Session reset failed, recycling: {e}")
+                keep = False
+
+        if keep:
+            with self._lock:
+                idle.append(driver)
+        else:
+            self._quit(driver)
+
+    def reset(self, driver):
+        """Clear cookies, storage, seeded state, throttling and extra windows so the next test starts clean"""
+        client_state.clear(driver)
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        clear_throttling(driver)
+
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # about:blank and data: URLs have no storage
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def shutdown(self):
+        """Quit every idle session"""
+        with self._lock:
+            drivers = [d for idle in self._idle.values() for d in idle]
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _apply_window(self, driver, headless, resolution):
+        if resolution:
+            driver.set_window_size(resolution[0], resolution[1])
+        elif not headless:
+            driver.maximize_window()
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️ Could not quit driver: {e}")
+
+
+# Global driver pool instance
+driver_pool = DriverPool()
@@ -0,0 +1,94 @@
+"""
+pytest-xdist scheduler driven by historical test durations
+Longest-processing-time-first, with tests that share a fixture profile
+(resolution, logged-in state, ...) kept together on one worker where
+that does not hurt the balance
+"""
+from collections import OrderedDict
+from xdist.scheduler import LoadScopeScheduling
+from utils.test_history import test_history
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """LPT scheduling of profile-affine work units"""
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self._unit_of = {}
+
+    def _split_scope(self, nodeid):
+        return self._unit_of.get(nodeid, nodeid)
+
+    def build_units(self, collection, workers):
+        """
+        Group tests into work units and order them longest first
+
+        Tests with the same profile share a unit until the unit reaches
+        roughly half a worker's fair share, so affinity never creates a
+        unit that dominates the makespan.
+
+        Returns:
+            OrderedDict of unit name -> list of nodeids, longest unit first
+        """
+        default = test_history.default_duration()
+        durations = {nodeid: test_history.duration(nodeid, default) for nodeid in collection}
+        total = sum(durations.values())
+        capacity = max(max(durations.values()), total / (max(workers, 1) * 2))
+
+        by_profile = OrderedDict()
+        for nodeid in collection:
+            by_profile.setdefault(test_history.profile(nodeid), []).append(nodeid)
+
+        units = []
+        for profile, nodeids in by_profile.items():
+            chunk, chunk_time = [], 0.0
+            for nodeid in sorted(nodeids, key=lambda n: -durations[n]):
+                if chunk and chunk_time + durations[nodeid] > capacity:
+                    units.append((chunk_time, f"{profile}#{len(units)}", chunk))
+                    chunk, chunk_time = [], 0.0
+                chunk.append(nodeid)
+                chunk_time += durations[nodeid]
+            units.append((chunk_time, f"{profile}#{len(units)}", chunk))
+
+        ordered = OrderedDict()
+        for _, name, nodeids in sorted(units, key=lambda unit: (-unit[0], unit[1])):
+            ordered[name] = nodeids
+        return ordered
+
+    def schedule(self):
+        """Same flow as LoadScopeScheduling.schedule with LPT-ordered units"""
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(next(iter(self.registered_collections.values())))
+        if not self.collection:
+            return
+
+        for name, nodeids in self.build_units(self.collection, len(self.nodes)).items():
+            self.workqueue[name] = {nodeid: False for nodeid in nodeids}
+            for nodeid in nodeids:
+                self._unit_of[nodeid] = name
+
+        extra_nodes = len(self.nodes) - len(self.workqueue)
+        if extra_nodes > 0:
+            self.log(f"Shutting down {extra_nodes} nodes")
+            for _ in range(extra_nodes):
+                unused_node, _ = self.assigned_work.popitem()
+                unused_node.shutdown()
+
+        for node in self.nodes:
+            self._assign_work_unit(node)
+        for node in self.nodes:
+            self._reschedule(node)
+
+        if not self.workqueue:
+            for node in self.nodes:
+                node.shutdown()
@@ -0,0 +1,60 @@
+"""
+Device emulation through the Chrome DevTools Protocol
+Switches viewport, DPR, touch and user agent inside one browser session
+
+There is no reload policy: a profile applied to a page that is already
+loaded only takes effect through resize events. The user agent, touch and
+mobile flags, and media queries the app evaluates once at bootstrap, keep
+their old values until the next navigation. Apply the profile first and
+navigate afterwards (pooled sessions come back on about:blank).
+"""
+from config.config import Config
+
+
+class DeviceEmulator:
+    """Applies Config.DEVICE_PROFILES to a Chrome session"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.current = None
+        self._default_user_agent = None
+
+    def apply(self, device_name):
+        """
+        Emulate a device from Config.RESOLUTIONS / Config.DEVICE_PROFILES
+
+        Takes full effect on the next navigation (see the module docstring).
+
+        Args:
+            device_name: Key of Config.RESOLUTIONS (mobile, tablet, desktop, wide)
+        """
+        width, height = Config.RESOLUTIONS[device_name]
+        profile = Config.DEVICE_PROFILES[device_name]
+
+        if self._default_user_agent is None:
+            self._default_user_agent = self.driver.execute_script("return navigator.userAgent")
+
+        self.driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": width,
+            "height": height,
+            "deviceScaleFactor": profile["dpr"],
+            "mobile": profile["mobile"],
+            "screenWidth": width,
+            "screenHeight": height,
+        })
+        self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {
+            "enabled": profile["touch"],
+            "maxTouchPoints": 5 if profile["touch"] else 1,
+        })
+        self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {
+            "userAgent": profile["user_agent"] or self._default_user_agent,
+        })
+        self.current = device_name
+
+    def clear(self):
+        """Drop all overrides so the session is back to its native window"""
+        self.driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+        self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+        if self._default_user_agent:
+            self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": self._default_user_agent})
+        self.current = None
@@ -0,0 +1,128 @@
+"""
+Environment health checks
+Probes the target app before tests run and stops a session from burning
+timeouts test after test once the environment is known to be down
+"""
+import time
+from datetime import datetime
+import requests
+from config.config import Config
+
+
+def probe_app(url=Config.BASE_URL, timeout=Config.HEALTH_PROBE_TIMEOUT):
+    """
+    Quick HTTP check of the target app
+
+    Returns:
+        (healthy, detail) - detail describes the failure or the response time
+    """
+    start = time.monotonic()
+    try:
+        response = requests.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        return False, f"{url} unreachable: {e.__class__.__name__}: {e}"
+    elapsed = time.monotonic() - start
+    if response.status_code >= 500:
+        return False, f"{url} returned HTTP {response.status_code}"
+    return True, f"{url} answered HTTP {response.status_code} in {elapsed:.2f}s"
+
+
+def is_environment_failure(error_text):
+    """Whether a failure message points at the environment rather than the app behaviour"""
+    return any(pattern in error_text for pattern in Config.ENVIRONMENT_ERROR_PATTERNS)
+
+
+class CircuitBreaker:
+    """
+    Opens after a failed health probe or K consecutive environment failures
+
+    While open, tests are skipped. The app is re-probed at most every
+    CIRCUIT_REPROBE_INTERVAL seconds and the breaker closes once it answers.
+    """
+
+    def __init__(self, threshold=Config.CIRCUIT_BREAKER_THRESHOLD, reprobe_interval=Config.CIRCUIT_REPROBE_INTERVAL):
+        self.threshold = threshold
+        self.reprobe_interval = reprobe_interval
+        self.consecutive = 0
+        self.reason = None
+        self.opened_at = None
+        self._probed = False
+        self._last_probe = 0.0
+
+    @property
+    def is_open(self):
+        return self.reason is not None
+
+    def check(self):
+        """
+        Called before each test
+
+        Returns:
+            None when the test may run, else the reason the environment is down
+        """
+        if not Config.HEALTH_CHECK:
+            return None
+        if not self._probed:
+            self._probed = True
+            self._probe()
+        elif self.is_open and time.monotonic() - self._last_probe >= self.reprobe_interval:
+            self._probe()
+        return self.reason
+
+    def record_failure(self, detail):
+        """Count an environment-class failure, opening the breaker at the threshold"""
+        self.consecutive += 1
+        if self.consecutive >= self.threshold and not self.is_open:
+            self._open(f"{self.consecutive} consecutive environment failures, last: {detail}")
+            self._last_probe = time.monotonic()
+
+    def record_success(self):
+        self.consecutive = 0
+
+    def _probe(self):
+        self._last_probe = time.monotonic()
+        healthy, detail = probe_app()
+        if healthy:
+            if self.is_open:
+                print(f"\n🟢 Environment recovered: {detail}")
+            self.reason, self.opened_at, self.consecutive = None, None, 0
+        elif not self.is_open:
+            self._open(f"health probe failed: {detail}")
+
+    def _open(self, reason):
+        self.reason = reason
+        self.opened_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"\n🔴 Circuit breaker open - {reason}")
+
+
+class EnvironmentIncident:
+    """Collects tests lost to an environment outage into one bug entry"""
+
+    def __init__(self):
+        self.tests = []
+        self.reasons = []
+
+    def add(self, nodeid, reason):
+        self.tests.append(nodeid)
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def log(self, bug_reporter):
+        """Log a single HIGH bug for the whole incident, if any test was affected"""
+        if not self.tests:
+            return None
+        error_message = "\n".join(
+            [f"Target: {Config.BASE_URL}", f"Tests affected: {len(self.tests)}", "", "Reasons:"]
+            + [f"  - {reason}" for reason in self.reasons]
+            + ["", "Tests:"] + [f"  - {nodeid}" for nodeid in self.tests]
+        )
+        return bug_reporter.log_bug(
+            test_name=f"ENVIRONMENT INCIDENT ({Config.BASE_URL})",
+            error_message=error_message,
+            severity="HIGH"
+        )
+
+
+# Global instances
+circuit_breaker = CircuitBreaker()
+environment_incident = EnvironmentIncident()
@@ -5,19 +5,22 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from config.config import Config
+from utils.driver_cache import chromedriver_cache
+from utils.browser_scripts import NETWORK_TRACKER_JS
+from utils.perf_metrics import collect_page_performance
+from utils.throttling import apply_throttling
+from utils.wait_policy import wait_policy
 from faker import Faker
 import time
-import platform
 
 
 fake = Faker()
 
 
-def get_driver(browser="chrome", headless=False, resolution=None):
+def get_driver(browser="chrome", headless=False, resolution=None, throttling="none"):
     """
     Initialize WebDriver for specified browser
     
@@ -25,6 +28,7 @@ def get_driver(browser="chrome", headless=False, resolution=None):
         browser: Browser name (chrome, firefox, edge)
         headless: Run in headless mode
         resolution: Tuple (width, height) for window size
+        throttling: Name of a Config.THROTTLING_PROFILES entry (Chromium only)
     
     Returns:
         WebDriver instance
@@ -52,42 +56,14 @@ def get_driver(browser="chrome", headless=False, resolution=None):
         }
         options.add_experimental_option("prefs", prefs)
         
-        # Windows 64-bit manual driver setup
-        if platform.system() == 'Windows' and platform.machine().endswith('64'):
-            import os
-            import zipfile
-            import requests
-            from pathlib import Path
-            
-            version = "143.0.7499.42"
-            download_url = f"https://storage.googleapis.com/chrome-for-testing-public/{version}/win64/chromedriver-win64.zip"
-            cache_dir = Path.home() / ".wdm" / "drivers" / "chromedriver" / "win64" / version
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            chromedriver_path = cache_dir / "chromedriver-win64" / "chromedriver.exe"
-            
-            if not chromedriver_path.exists():
-                print(f"Downloading ChromeDriver {version} for win64...")
-                response = requests.get(download_url)
-                zip_path = cache_dir / "chromedriver.zip"
-                
-                with open(zip_path, 'wb') as f:
-                    f.write(response.content)
-                
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(cache_dir)
-                
-                os.remove(zip_path)
-                print(f"ChromeDriver installed at: {chromedriver_path}")
-            
-            driver = webdriver.Chrome(
-                service=ChromeService(str(chromedriver_path)),
-                options=options
-            )
-        else:
-            driver = webdriver.Chrome(
-                service=ChromeService(ChromeDriverManager().install()),
-                options=options
-            )
+        # Driver binary comes from the local, file-locked cache (works offline)
+        driver = webdriver.Chrome(
+            service=ChromeService(chromedriver_cache.resolve()),
+            options=options
+        )
+        
+        # Count fetch/XHR from the first request on, for BasePage.wait_for_app_idle
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})
     
     elif browser.lower() == "firefox":
         options = webdriver.FirefoxOptions()
@@ -117,10 +93,14 @@ def get_driver(browser="chrome", headless=False, resolution=None):
     elif not headless:
         driver.maximize_window()
     
-    # Set timeouts
-    driver.implicitly_wait(Config.IMPLICIT_WAIT)
+    # Set timeouts - implicit wait is owned (and kept at 0) by the wait policy
+    wait_policy.apply(driver)
     driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
     
+    # Network and CPU throttling for comparable timings across runners
+    if throttling != "none":
+        apply_throttling(driver, throttling)
+    
     return driver
 
 
@@ -151,28 +131,14 @@ def measure_performance(driver, url):
     Measure page load performance
     
     Returns:
-        dict with performance metrics
+        PagePerformance (total_load_time is the wall clock around driver.get)
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     driver.get(url)
-    load_time = time.time() - start_time
-    
-    # Get Navigation Timing metrics
-    try:
-        nav_start = driver.execute_script("return window.performance.timing.navigationStart")
-        response_start = driver.execute_script("return window.performance.timing.responseStart")
-        dom_complete = driver.execute_script("return window.performance.timing.domComplete")
-        load_complete = driver.execute_script("return window.performance.timing.loadEventEnd")
-        
-        metrics = {
-            "total_load_time": load_time,
-            "backend_time": (response_start - nav_start) / 1000.0,
-            "frontend_time": (dom_complete - response_start) / 1000.0,
-            "page_load_time": (load_complete - nav_start) / 1000.0
-        }
-    except:
-        metrics = {"total_load_time": load_time}
+    load_time = time.perf_counter() - start_time
     
+    metrics = collect_page_performance(driver)
+    metrics.total_load_time = load_time
     return metrics
 
 
@@ -0,0 +1,425 @@
+"""
+Protocol-level API load generator
+Replays the UI's search, login and basket calls over a keep-alive
+connection pool on asyncio, with open-model (Poisson) arrivals and
+HDR-style latency histograms. Thousands of requests per second from one
+process, no browser involved.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import ssl
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+from config.config import Config
+from utils.helpers import BoundaryValues, generate_test_user
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram
+
+    Values are kept in microseconds. Below 2 * 10^digits every value has its
+    own bucket; above, each power of two is split into the same number of
+    sub-buckets, so any recorded value is within 10^-digits of its bucket.
+    Memory is bounded by the value range, not by the number of samples.
+    """
+
+    def __init__(self, significant_digits=Config.HTTP_LOAD_HISTOGRAM_DIGITS):
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        half = self.sub_bucket_count // 2
+        return self.sub_bucket_count + (shift - 1) * half + (value >> shift) - half
+
+    def _highest_equivalent(self, index):
+        """Largest value that lands in the bucket (what percentiles report)"""
+        if index < self.sub_bucket_count:
+            return index
+        half = self.sub_bucket_count // 2
+        shift = (index - self.sub_bucket_count) // half + 1
+        sub_bucket = (index - self.sub_bucket_count) % half + half
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add another histogram's counts (same precision)"""
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        """Value at percentile q (0-100) in seconds, None when empty"""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def to_dict(self):
+        if not self.count:
+            return {}
+        return {"p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99),
+                "p99.9": self.percentile(99.9), "max": self.max / 1_000_000,
+                "mean": self.total / self.count / 1_000_000}
+
+
+class HttpConnection:
+    """One HTTP/1.1 keep-alive connection on asyncio streams"""
+
+    def __init__(self, host, port, ssl_context=None):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.reader = None
+        self.writer = None
+        self.requests = 0
+
+    @property
+    def open(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None)
+
+    async def request(self, method, target, headers=None, body=None):
+        """
+        Send one request and read the whole response
+
+        Returns:
+            (status, body bytes)
+        """
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}", "Connection: keep-alive",
+                 "Accept: application/json", f"Content-Length: {len(body) if body else 0}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self.writer.drain()
+        self.requests += 1
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        response_headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = await self._read_chunked()
+        elif "content-length" in response_headers:
+            payload = await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            payload = await self.reader.read()  # Delimited by the server closing the connection
+            self.close()
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, payload
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                await self.reader.readuntil(b"\r\n")  # Last chunk; trailers are not used by the app
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ConnectionPool:
+    """Bounded pool of keep-alive connections to one origin"""
+
+    def __init__(self, base_url, size=Config.HTTP_LOAD_CONNECTIONS):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.base_path = url.path.rstrip("/")
+        self.ssl_context = ssl.create_default_context() if url.scheme == "https" else None
+        self.size = size
+        self.opened = 0
+        self._idle = []
+        self._slots = None
+
+    async def request(self, method, path, headers=None, json_body=None):
+        """
+        Request path on a pooled connection
+
+        A reused connection the server has closed in the meantime is
+        replaced once; any other failure propagates.
+
+        Returns:
+            (status, body bytes)
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        body = json.dumps(json_body).encode() if json_body is not None else None
+        if body is not None:
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            for attempt in range(2):
+                reused = connection is not None
+                if connection is None:
+                    connection = HttpConnection(self.host, self.port, self.ssl_context)
+                    await connection.connect()
+                    self.opened += 1
+                try:
+                    result = await connection.request(method, self.base_path + path, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    connection = None
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:  # Timeouts and cancellation leave a half-read response behind
+                    connection.close()
+                    raise
+                if connection.open:
+                    self._idle.append(connection)
+                return result
+
+    def close(self):
+        for connection in self._idle:
+            connection.close()
+        self._idle = []
+
+
+class ApiWorkload:
+    """
+    The UI's API calls as a weighted request mix
+
+    Search terms are the search boundary values, accounts come from
+    generate_test_user() and are registered up front so login and basket
+    calls exercise the authenticated paths. Registration creates real
+    accounts, so it must be allowed explicitly (stand-in server or an own
+    instance opted in with API_REGISTER_TEST_USER=1).
+    """
+
+    def __init__(self, mix=Config.HTTP_LOAD_MIX, accounts=Config.HTTP_LOAD_ACCOUNTS, register=False):
+        self.mix = dict(mix)
+        self.register = register
+        self.terms = list(BoundaryValues.get_search_boundaries().values())
+        self.accounts = [generate_test_user() for _ in range(accounts)]
+        self.sessions = []  # {"token", "bid"} per logged-in account
+
+    async def prepare(self, pool):
+        """Register and log in every account (not measured)"""
+        if self.accounts and not self.register:
+            raise RuntimeError(f"Refusing to register {len(self.accounts)} accounts on {pool.host}:{pool.port}: "
+                               f"allowed on the stand-in or with API_REGISTER_TEST_USER=1")
+        for account in self.accounts:
+            await pool.request("POST", "/api/Users/", json_body={
+                "email": account["email"], "password": account["password"],
+                "passwordRepeat": account["password"], "securityQuestion": {"id": 1},
+                "securityAnswer": "automation"
+            })
+            status, body = await pool.request("POST", "/rest/user/login", json_body={
+                "email": account["email"], "password": account["password"]
+            })
+            if status == 200:
+                authentication = json.loads(body)["authentication"]
+                self.sessions.append({"token": authentication["token"], "bid": authentication.get("bid")})
+        if not self.sessions and self.mix.pop("basket", None):
+            print("⚠️ No account could log in: basket calls left out of the mix")
+
+    def next_request(self, rng):
+        """
+        Draw the next call
+
+        Returns:
+            (name, method, path, headers, JSON body)
+        """
+        name = rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if name == "search":
+            return name, "GET", f"/rest/products/search?q={quote(rng.choice(self.terms))}", None, None
+        if name == "login":
+            account = rng.choice(self.accounts)
+            return name, "POST", "/rest/user/login", None, {"email": account["email"],
+                                                            "password": account["password"]}
+        if name == "basket":
+            session = rng.choice(self.sessions)
+            return name, "GET", f"/rest/basket/{session['bid']}", {"Authorization": f"Bearer {session['token']}"}, None
+        raise ValueError(f"Unknown API call in the mix: {name}")
+
+
+class HttpLoadGenerator:
+    """
+    Open-model load: requests arrive as a Poisson process at a target rate,
+    whether or not earlier ones have finished
+
+    Latency is measured from the scheduled arrival, not from the moment the
+    request was sent, so a stalled server shows up in the percentiles
+    (no coordinated omission). Arrivals beyond max_in_flight are dropped and
+    counted instead of queueing.
+    """
+
+    def __init__(self, base_url, rps=Config.HTTP_LOAD_RPS, duration=Config.HTTP_LOAD_DURATION,
+                 connections=Config.HTTP_LOAD_CONNECTIONS, max_in_flight=Config.HTTP_LOAD_MAX_IN_FLIGHT,
+                 timeout=Config.HTTP_LOAD_TIMEOUT, workload=None, seed=None, register_accounts=False):
+        self.base_url = base_url
+        self.rps = rps
+        self.duration = duration
+        self.connections = connections
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.workload = workload or ApiWorkload(register=register_accounts)
+        self._rng = random.Random(seed)
+        self._in_flight = set()
+        self.histograms = {}
+        self.statuses = {}
+        self.dropped = 0
+
+    def run(self):
+        """
+        Run the load test
+
+        Returns:
+            HttpLoadReport
+        """
+        print(f"🚦 API load: {self.rps} req/s (Poisson) for {self.duration}s against {self.base_url}, "
+              f"{self.connections} connections")
+        return asyncio.run(self._run())
+
+    async def _run(self):
+        pool = ConnectionPool(self.base_url, self.connections)
+        await self.workload.prepare(pool)
+        self.histograms = {name: LatencyHistogram() for name in self.workload.mix}
+        self.statuses = {name: Counter() for name in self.workload.mix}
+
+        loop = asyncio.get_running_loop()
+        start = arrival = loop.time()
+        try:
+            while True:
+                arrival += self._rng.expovariate(self.rps)
+                if arrival - start >= self.duration:
+                    break
+                delay = arrival - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(self._in_flight) >= self.max_in_flight:
+                    self.dropped += 1
+                    continue
+                task = asyncio.create_task(self._fire(pool, arrival))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            await asyncio.gather(*self._in_flight)
+            elapsed = loop.time() - start
+        finally:
+            pool.close()
+        return HttpLoadReport.from_run(self, elapsed, pool.opened)
+
+    async def _fire(self, pool, scheduled):
+        name, method, path, headers, body = self.workload.next_request(self._rng)
+        try:
+            status, _ = await asyncio.wait_for(pool.request(method, path, headers, body), self.timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            status = e.__class__.__name__
+        self.histograms[name].record(asyncio.get_running_loop().time() - scheduled)
+        self.statuses[name][str(status)] += 1
+
+
+@dataclass
+class HttpLoadReport:
+    """Throughput, error rate and latency percentiles, overall and per API call"""
+    target: str
+    target_rps: float
+    duration: float
+    requests: int
+    dropped: int
+    errors: int
+    error_rate: float
+    throughput: float  # Completed requests per second
+    connections: int  # Connections opened over the run
+    latency: dict  # p50/p90/p99/p99.9/max/mean, seconds from the scheduled arrival
+    endpoints: dict
+
+    @classmethod
+    def from_run(cls, generator, elapsed, connections):
+        overall = LatencyHistogram()
+        endpoints = {}
+        for name, histogram in generator.histograms.items():
+            overall.merge(histogram)
+            statuses = generator.statuses[name]
+            errors = sum(n for status, n in statuses.items() if not _succeeded(status))
+            endpoints[name] = {"requests": histogram.count, "errors": errors, "statuses": dict(statuses),
+                               "latency": histogram.to_dict()}
+        errors = sum(e["errors"] for e in endpoints.values())
+        return cls(
+            target=generator.base_url,
+            target_rps=generator.rps,
+            duration=elapsed,
+            requests=overall.count,
+            dropped=generator.dropped,
+            errors=errors,
+            error_rate=errors / overall.count if overall.count else 0.0,
+            throughput=overall.count / elapsed if elapsed else 0.0,
+            connections=connections,
+            latency=overall.to_dict(),
+            endpoints=endpoints
+        )
+
+    def save(self, directory=Config.LOAD_REPORTS_DIR):
+        """Write the report as JSON, returns the path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"http_load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+        return path
+
+    def summary(self):
+        lines = [f"{self.requests} requests in {self.duration:.1f}s: {self.throughput:.0f}/s "
+                 f"(target {self.target_rps}/s), {self.dropped} dropped, error rate {self.error_rate:.1%}, "
+                 f"{self.connections} connections, latency {_format(self.latency)}"]
+        for name, endpoint in self.endpoints.items():
+            lines.append(f"  {name:<8} {endpoint['requests']:>7}  errors {endpoint['errors']:>5}  "
+                         f"{_format(endpoint['latency'])}")
+        return "\n".join(lines)
+
+
+def _succeeded(status):
+    return status.isdigit() and int(status) < 400
+
+
+def _format(latency):
+    if not latency:
+        return "n/a"
+    return " ".join(f"{name}={value * 1000:.1f}ms" for name, value in latency.items())
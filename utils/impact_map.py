@@ -0,0 +1,222 @@
+"""
+Test impact analysis
+Records which page-object methods and locators each test exercises and
+selects the tests affected by a git diff
+"""
+import ast
+import glob
+import os
+import re
+import subprocess
+import sys
+import threading
+from config.config import Config
+
+
+PAGES_DIR = os.path.join(Config.BASE_DIR, "pages")
+TESTS_DIR = os.path.join(Config.BASE_DIR, "tests")
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def _relative(path):
+    return os.path.relpath(path, Config.BASE_DIR).replace(os.sep, "/")
+
+
+class SourceIndex:
+    """
+    Symbols of one source file with their line ranges
+
+    Symbols are "path::Class.method" for functions and "path::Class.NAME"
+    for class-level locators. Lines outside any symbol belong to "path".
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file_symbol = _relative(path)
+        self.functions = []  # (symbol, first line incl. decorators, last line)
+        self.locators = {}  # symbol -> (first line, last line)
+        self.locators_used = {}  # function symbol -> attribute names it reads
+        with open(path, encoding="utf-8") as f:
+            self._visit(ast.parse(f.read()).body, [])
+
+    def _visit(self, body, scope):
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                self._visit(node.body, scope + [node.name])
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                symbol = f"{self.file_symbol}::{'.'.join(scope + [node.name])}"
+                start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                self.functions.append((symbol, start, node.end_lineno))
+                self.locators_used[symbol] = {
+                    n.attr for n in ast.walk(node) if isinstance(n, ast.Attribute) and n.attr.isupper()
+                }
+            elif isinstance(node, ast.Assign) and scope:
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and target.id.isupper():
+                        symbol = f"{self.file_symbol}::{'.'.join(scope + [target.id])}"
+                        self.locators[symbol] = (node.lineno, node.end_lineno)
+
+    def symbol_at(self, line):
+        """Innermost symbol covering a line, or the file symbol"""
+        best = None
+        for symbol, start, end in self.functions:
+            if start <= line <= end and (best is None or start >= best[1]):
+                best = (symbol, start)
+        if best is not None:
+            return best[0]
+        for symbol, (start, end) in self.locators.items():
+            if start <= line <= end:
+                return symbol
+        return self.file_symbol
+
+    def function_at(self, line):
+        """Function symbol whose body contains a line (for call tracing)"""
+        for symbol, start, end in self.functions:
+            if start <= line <= end:
+                return symbol
+        return None
+
+
+class ImpactRecorder:
+    """Traces calls into pages/* while a test runs"""
+
+    def __init__(self, pages_dir=PAGES_DIR):
+        self.indexes = {path: SourceIndex(path) for path in glob.glob(os.path.join(pages_dir, "*.py"))}
+        self._locator_names = {}
+        for index in self.indexes.values():
+            for symbol in index.locators:
+                self._locator_names.setdefault(symbol.rsplit(".", 1)[1], set()).add(symbol)
+        self._code_symbols = {}
+        self._called = set()
+
+    def start(self):
+        """Start recording calls for a new test"""
+        self._called = set()
+        sys.setprofile(self._profile)
+        threading.setprofile(self._profile)
+
+    def stop(self, test_source=""):
+        """
+        Stop recording
+
+        Args:
+            test_source: Source of the test function, scanned for locators it names directly
+
+        Returns:
+            Sorted list of page methods called and locators they (or the test) use
+        """
+        sys.setprofile(None)
+        threading.setprofile(None)
+        symbols = set(self._called)
+        names = set(re.findall(r"\.([A-Z][A-Z0-9_]+)\b", test_source))
+        for symbol in self._called:
+            index = self.indexes[self._file_of(symbol)]
+            names |= index.locators_used.get(symbol, set())
+        for name in names:
+            symbols |= self._locator_names.get(name, set())
+        return sorted(symbols)
+
+    def _profile(self, frame, event, arg):
+        if event != "call":
+            return
+        code = frame.f_code
+        symbol = self._code_symbols.get(code, False)
+        if symbol is False:
+            index = self.indexes.get(code.co_filename)
+            symbol = index.function_at(code.co_firstlineno) if index else None
+            self._code_symbols[code] = symbol
+        if symbol:
+            self._called.add(symbol)
+
+    @staticmethod
+    def _file_of(symbol):
+        return os.path.join(Config.BASE_DIR, *symbol.split("::")[0].split("/"))
+
+
+# Global impact recorder instance
+impact_recorder = ImpactRecorder()
+
+
+def changed_symbols(ref):
+    """
+    Symbols touched by the working tree's diff against a git ref
+
+    Returns:
+        (symbols, other_files): symbols in pages/ and tests/, and any other
+        changed project files (their impact is unknown)
+    """
+    diff = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", ref, "--", "."],
+        cwd=Config.BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=Config.BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    symbols, other_files, old_path, index = set(), set(), None, None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            old_path = None if line[4:] == "/dev/null" else line[6:]
+        elif line.startswith("+++ "):
+            deleted = line[4:] == "/dev/null"
+            path = old_path if deleted else line[6:]
+            index = _index_for(path)
+            if deleted and _in_pages_or_tests(path):
+                symbols.add(path)  # Deleted page/test module
+            elif index is None and _affects_tests(path):
+                other_files.add(path)
+        else:
+            match = HUNK_RE.match(line)
+            if match and index is not None:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                for number in range(start, start + max(count, 1)):
+                    symbols.add(index.symbol_at(number))
+
+    for path in untracked:
+        index = _index_for(path)
+        if index is not None:
+            symbols.add(index.file_symbol)
+        elif _affects_tests(path):
+            other_files.add(path)
+    return symbols, sorted(other_files)
+
+
+def _affects_tests(path):
+    """Changed file that can change test behaviour (code or test configuration)"""
+    return path.endswith(".py") or os.path.basename(path) in ("pytest.ini", "requirements.txt")
+
+
+def _in_pages_or_tests(path):
+    return (path.endswith(".py") and os.path.basename(path) != "conftest.py"
+            and os.path.dirname(os.path.join(Config.BASE_DIR, path)) in (PAGES_DIR, TESTS_DIR))
+
+
+def _index_for(path):
+    """SourceIndex for an existing pages/ or tests/ module (conftest reaches every test: None)"""
+    full_path = os.path.join(Config.BASE_DIR, path)
+    if not _in_pages_or_tests(path) or not os.path.isfile(full_path):
+        return None
+    return SourceIndex(full_path)
+
+
+def is_impacted(nodeid, recorded, changed):
+    """
+    Whether a test is affected by the changed symbols
+
+    Args:
+        nodeid: pytest nodeid
+        recorded: symbols the test exercised in the recorded run (None = never recorded)
+        changed: symbols returned by changed_symbols
+    """
+    test_file, name = nodeid.split("[")[0].split("::", 1)
+    test_symbol = f"{test_file}::{name.replace('::', '.')}"
+    for symbol in changed:
+        if symbol == test_file or symbol == test_symbol:
+            return True  # The test itself or its module-level code changed
+        if symbol.startswith(f"{test_file}::") and not symbol.split("::", 1)[1].rsplit(".", 1)[-1].startswith("test"):
+            return True  # Fixture or helper in the test module
+    if recorded is None:
+        return True  # No impact data: run it to be safe
+    touched_files = {symbol.split("::")[0] for symbol in recorded}
+    return any(symbol in recorded or symbol in touched_files for symbol in changed)
@@ -0,0 +1,171 @@
+"""
+Performance baseline store
+Keeps every harness sample in SQLite, tagged by app build and runner, and
+flags runs that are significantly slower than the rolling baseline
+"""
+import math
+import os
+import socket
+import sqlite3
+import statistics
+from dataclasses import dataclass
+from config.config import Config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    profile TEXT NOT NULL DEFAULT 'none',
+    build TEXT NOT NULL,
+    runner TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    regressed INTEGER NOT NULL DEFAULT 0,
+    accepted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_lookup ON runs (scenario, mode, runner, id);
+"""
+
+
+def mann_whitney_greater(current, baseline):
+    """
+    One-sided Mann-Whitney U test: are current values stochastically larger?
+
+    Normal approximation with tie and continuity correction.
+
+    Returns:
+        (U statistic of current, p-value)
+    """
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks, ties, i = [0.0] * len(combined), 0.0, 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2.0 + 1
+        group = j - i + 1
+        ties += group ** 3 - group
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, source) in zip(ranks, combined) if source == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / math.sqrt(variance)
+    return u, 1 - statistics.NormalDist().cdf(z)
+
+
+@dataclass
+class Regression:
+    """A significant slowdown of a scenario against its baseline"""
+    scenario: str
+    mode: str
+    baseline_median: float
+    current_median: float
+    p_value: float
+    baseline_runs: int
+    profile: str = "none"
+
+    @property
+    def delta(self):
+        return self.current_median - self.baseline_median
+
+    @property
+    def delta_pct(self):
+        return self.delta / self.baseline_median * 100 if self.baseline_median else float("inf")
+
+    def __str__(self):
+        return (f"{self.scenario} ({self.mode}, {self.profile}) regressed: median {self.current_median:.3f}s vs baseline "
+                f"{self.baseline_median:.3f}s (+{self.delta:.3f}s, +{self.delta_pct:.1f}%), "
+                f"Mann-Whitney p={self.p_value:.4f} over the last {self.baseline_runs} runs")
+
+
+class PerfBaseline:
+    """SQLite store of performance samples with regression checks"""
+
+    def __init__(self, path=Config.PERF_BASELINE_DB, runner=Config.PERF_RUNNER or socket.gethostname()):
+        self.path = path
+        self.runner = runner
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript(SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(runs)")}
+        if "profile" not in columns:
+            # Stores created before throttling profiles hold unthrottled runs
+            connection.execute("ALTER TABLE runs ADD COLUMN profile TEXT NOT NULL DEFAULT 'none'")
+        if "accepted" not in columns:
+            connection.execute("ALTER TABLE runs ADD COLUMN accepted INTEGER NOT NULL DEFAULT 0")
+        return connection
+
+    def baseline(self, scenario, mode, profile="none", runs=Config.PERF_BASELINE_RUNS):
+        """
+        Rolling baseline: samples of the last non-regressed runs of this
+        scenario, cache mode and throttling profile on this runner, starting
+        at the most recently accepted run (see record(accepted=True))
+
+        Returns:
+            (samples, number of runs)
+        """
+        with self._connect() as connection:
+            run_ids = [row[0] for row in connection.execute(
+                "SELECT id FROM runs WHERE scenario = ?1 AND mode = ?2 AND profile = ?3 AND runner = ?4 "
+                "AND regressed = 0 AND id >= (SELECT COALESCE(MAX(id), 0) FROM runs WHERE scenario = ?1 "
+                "AND mode = ?2 AND profile = ?3 AND runner = ?4 AND accepted = 1) ORDER BY id DESC LIMIT ?5",
+                (scenario, mode, profile, self.runner, runs))]
+            if not run_ids:
+                return [], 0
+            placeholders = ",".join("?" * len(run_ids))
+            samples = [row[0] for row in connection.execute(
+                f"SELECT value FROM samples WHERE run_id IN ({placeholders})", run_ids)]
+        return samples, len(run_ids)
+
+    def check(self, scenario, mode, samples, profile="none"):
+        """
+        Compare samples against the rolling baseline
+
+        A regression needs a one-sided Mann-Whitney p-value below
+        PERF_REGRESSION_ALPHA and a median slowdown of at least
+        PERF_REGRESSION_MIN_DELTA, so tiny but consistent shifts do not fire.
+
+        Returns:
+            Regression, or None (also when the baseline is still too small)
+        """
+        baseline, runs = self.baseline(scenario, mode, profile)
+        if len(baseline) < Config.PERF_BASELINE_MIN_SAMPLES:
+            return None
+        _, p_value = mann_whitney_greater(samples, baseline)
+        regression = Regression(scenario, mode, statistics.median(baseline), statistics.median(samples),
+                                p_value, runs, profile)
+        if p_value < Config.PERF_REGRESSION_ALPHA and regression.delta_pct >= Config.PERF_REGRESSION_MIN_DELTA * 100:
+            return regression
+        return None
+
+    def record(self, scenario, mode, samples, build, recorded_at, regressed=False, profile="none", accepted=False):
+        """
+        Store a run's samples (regressed runs are kept but excluded from the baseline)
+
+        An accepted run starts a new baseline: older runs no longer count,
+        so an intended slowdown stops being reported as a regression.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (scenario, mode, profile, build, runner, recorded_at, regressed, accepted) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (scenario, mode, profile, build, self.runner, recorded_at, int(regressed), int(accepted)))
+            connection.executemany("INSERT INTO samples (run_id, value) VALUES (?, ?)",
+                                   [(cursor.lastrowid, value) for value in samples])
+
+
+# Global baseline instance
+perf_baseline = PerfBaseline()
@@ -0,0 +1,191 @@
+"""
+Statistical performance harness
+Runs a scenario with warmup and repeated measurements on a cold or warm
+browser cache under a throttling profile, summarises the samples with percentiles and a bootstrap
+confidence interval, and checks them against the stored baseline
+"""
+import json
+import os
+import random
+import statistics
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from config.config import Config
+from utils.file_lock import FileLock
+from utils.perf_baseline import Regression, perf_baseline
+from utils.result_cache import result_cache
+
+
+CACHE_MODES = ("cold", "warm")
+
+
+def percentile(samples, q):
+    """Percentile q (0-100) with linear interpolation between closest ranks"""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def bootstrap_ci(samples, stat=statistics.median, confidence=Config.PERF_CONFIDENCE,
+                 resamples=Config.PERF_BOOTSTRAP_RESAMPLES, seed=0):
+    """Percentile bootstrap confidence interval of stat(samples)"""
+    rng = random.Random(seed)
+    estimates = sorted(stat(rng.choices(samples, k=len(samples))) for _ in range(resamples))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+@dataclass
+class PerfStats:
+    """Summary of one scenario's samples (seconds)"""
+    n: int
+    mean: float
+    stdev: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+    ci_low: float  # Bootstrap CI of the median
+    ci_high: float
+
+    @classmethod
+    def from_samples(cls, samples):
+        ci_low, ci_high = bootstrap_ci(samples)
+        return cls(
+            n=len(samples),
+            mean=statistics.fmean(samples),
+            stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            min=min(samples),
+            max=max(samples),
+            p50=percentile(samples, 50),
+            p90=percentile(samples, 90),
+            p99=percentile(samples, 99),
+            ci_low=ci_low,
+            ci_high=ci_high
+        )
+
+    def __str__(self):
+        return (f"n={self.n} p50={self.p50:.3f}s p90={self.p90:.3f}s p99={self.p99:.3f}s "
+                f"stdev={self.stdev:.3f}s median CI[{self.ci_low:.3f}, {self.ci_high:.3f}]")
+
+
+@dataclass
+class PerfRun:
+    """Samples and statistics of one scenario in one cache mode and throttling profile"""
+    scenario: str
+    mode: str
+    samples: list
+    stats: PerfStats
+    timestamp: str
+    build: str = "unknown"
+    profile: str = "none"  # Config.THROTTLING_PROFILES entry the samples were taken under
+    regression: Regression = None  # Significant slowdown against the rolling baseline
+
+    def violations(self, thresholds=None):
+        """
+        Percentile thresholds this run exceeds, plus a baseline regression
+
+        Args:
+            thresholds: {"p90": seconds, ...}, default Config.PERF_THRESHOLDS[profile][scenario]
+                        ("none" limits for a profile without its own)
+
+        Returns:
+            list of messages, empty when every threshold holds
+        """
+        if thresholds is None:
+            if self.profile not in Config.PERF_THRESHOLDS:
+                print(f"⚠️ No thresholds for throttling profile '{self.profile}', checking the unthrottled ones")
+            profile_thresholds = Config.PERF_THRESHOLDS.get(self.profile, Config.PERF_THRESHOLDS["none"])
+            thresholds = profile_thresholds.get(self.scenario, {})
+        messages = [
+            f"{self.scenario} ({self.mode}, {self.profile}) {name}={getattr(self.stats, name):.3f}s exceeds {limit}s"
+            for name, limit in thresholds.items() if getattr(self.stats, name) > limit
+        ]
+        if self.regression is not None:
+            messages.append(f"{self.regression} (build {self.build})")
+        return messages
+
+
+class PerfHarness:
+    """Warmup + N measured repetitions of a scenario"""
+
+    def __init__(self, driver, warmup=Config.PERF_WARMUP, repetitions=Config.PERF_REPETITIONS,
+                 samples_file=Config.PERF_SAMPLES_FILE, profile="none", accept_baseline=False):
+        self.driver = driver
+        self.profile = profile  # Throttling the driver runs under (applied by the caller)
+        self.accept_baseline = accept_baseline  # Runs start a new baseline instead of being checked
+        self.warmup = warmup
+        self.repetitions = repetitions
+        self.samples_file = samples_file
+
+    def run(self, scenario, measure, mode="warm", setup=None):
+        """
+        Measure a scenario
+
+        Args:
+            scenario: Name used for thresholds and persisted samples
+            measure: Callable returning one duration in seconds, or a list of them
+            mode: "cold" clears the HTTP cache before every iteration, "warm" keeps it
+                  (the warmup iterations fill it)
+            setup: Optional untimed callable run before every iteration
+
+        Returns:
+            PerfRun
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+
+        samples = []
+        for iteration in range(self.warmup + self.repetitions):
+            if mode == "cold":
+                self.clear_cache()
+            if setup is not None:
+                setup()
+            result = measure()
+            if iteration >= self.warmup:
+                samples.extend(result if isinstance(result, (list, tuple)) else [result])
+        return self.record(scenario, samples, mode)
+
+    def record(self, scenario, samples, mode="warm"):
+        """
+        Summarise samples measured elsewhere (e.g. a phase of another
+        scenario), check them against the baseline and persist them
+
+        A regression is reported through violations(): the failing test is
+        logged as a HIGH performance bug by the conftest hook.
+
+        Returns:
+            PerfRun
+        """
+        fingerprint = result_cache.app_fingerprint()
+        run = PerfRun(scenario, mode, samples, PerfStats.from_samples(samples),
+                      datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                      build=fingerprint[:12] if fingerprint else "unknown", profile=self.profile)
+        if not self.accept_baseline:
+            run.regression = perf_baseline.check(scenario, mode, samples, self.profile)
+        perf_baseline.record(scenario, mode, samples, run.build, run.timestamp, regressed=run.regression is not None,
+                             profile=self.profile, accepted=self.accept_baseline)
+        self.persist(run)
+        print(f"📈 {scenario} ({mode}, {self.profile}): {run.stats}")
+        if self.accept_baseline:
+            print(f"📌 {scenario} ({mode}, {self.profile}): accepted as the new baseline")
+        if run.regression is not None:
+            print(f"🔺 {run.regression}")
+        return run
+
+    def clear_cache(self):
+        """Drop the browser's HTTP cache (Chromium only)"""
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+
+    def persist(self, run):
+        """Append the raw samples and statistics to the samples file (JSON lines)"""
+        os.makedirs(os.path.dirname(self.samples_file), exist_ok=True)
+        with FileLock(self.samples_file):
+            with open(self.samples_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(run)) + "\n")
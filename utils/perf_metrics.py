@@ -0,0 +1,170 @@
+"""
+Page performance collector
+Navigation Timing Level 2, paint timings, LCP and CLS in one browser round trip,
+and the event timeline of a search (keystroke, API response, results render)
+"""
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+from config.config import Config
+from utils.browser_scripts import PAGE_PERFORMANCE_JS, SEARCH_LATENCY_JS, SEARCH_LATENCY_RESULT_JS
+
+
+@dataclass
+class PagePerformance:
+    """
+    Performance of the current document. Times are seconds from the start
+    of the navigation, None when the browser did not report them.
+    """
+    url: str
+    complete: bool  # loadEventEnd was reached before the collector timed out
+    ttfb: Optional[float] = None
+    dom_content_loaded: Optional[float] = None
+    dom_complete: Optional[float] = None
+    page_load_time: Optional[float] = None  # loadEventEnd
+    first_paint: Optional[float] = None
+    first_contentful_paint: Optional[float] = None
+    largest_contentful_paint: Optional[float] = None
+    cumulative_layout_shift: float = 0.0
+    transfer_size: Optional[int] = None
+    total_load_time: Optional[float] = None  # Wall clock around driver.get, when measured
+    navigation: Optional[dict] = field(default=None, repr=False)  # Raw PerformanceNavigationTiming entry
+
+    @property
+    def backend_time(self):
+        """Time to first byte"""
+        return self.ttfb
+
+    @property
+    def frontend_time(self):
+        """First byte to DOM complete"""
+        if self.dom_complete is None or self.ttfb is None:
+            return None
+        return self.dom_complete - self.ttfb
+
+    @classmethod
+    def from_script(cls, result, url):
+        """Build from the PAGE_PERFORMANCE_JS result (milliseconds)"""
+        nav = result.get("navigation") or {}
+
+        def seconds(value):
+            return None if value is None else value / 1000.0
+
+        def mark(name):
+            # Navigation Timing reports 0 for an event that has not happened yet
+            return None if nav.get(name) == 0 else seconds(nav.get(name))
+
+        return cls(
+            url=url,
+            complete=bool(result.get("complete")),
+            ttfb=mark("responseStart"),
+            dom_content_loaded=mark("domContentLoadedEventEnd"),
+            dom_complete=mark("domComplete"),
+            page_load_time=mark("loadEventEnd"),
+            first_paint=seconds(result.get("firstPaint")),
+            first_contentful_paint=seconds(result.get("firstContentfulPaint")),
+            largest_contentful_paint=seconds(result.get("largestContentfulPaint")),
+            cumulative_layout_shift=result.get("cumulativeLayoutShift") or 0.0,
+            transfer_size=nav.get("transferSize"),
+            navigation=nav or None
+        )
+
+    def to_dict(self):
+        data = asdict(self)
+        data.pop("navigation")
+        return data
+
+
+def collect_page_performance(driver, timeout=Config.PERF_COLLECT_TIMEOUT, settle_ms=Config.PERF_LCP_SETTLE_MS):
+    """
+    Collect the current document's performance in a single async script
+
+    Waits (in the browser) until loadEventEnd is set, so the result is never
+    read from a half-finished navigation. Check .complete before asserting.
+
+    Returns:
+        PagePerformance
+    """
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        result = driver.execute_async_script(PAGE_PERFORMANCE_JS, int(timeout * 1000), settle_ms)
+    finally:
+        driver.set_script_timeout(previous_timeout)
+    return PagePerformance.from_script(result or {}, driver.current_url)
+
+
+@dataclass
+class SearchLatency:
+    """
+    Timeline of one search. Browser times are seconds on the page's
+    performance.now() clock, None when the event was not seen.
+    """
+    term: str
+    api_url: Optional[str] = None  # Search request answered after the keystroke, None if results came client-side
+    input_to_request: Optional[float] = None  # Enter keydown -> search request sent
+    input_to_response: Optional[float] = None  # Enter keydown -> search response received
+    response_to_render: Optional[float] = None  # Search response -> first results grid mutation after it
+    input_to_render: Optional[float] = None  # Enter keydown -> results grid mutation that shows the results
+    dispatch: Optional[float] = None  # send_keys(Enter) round trip on the Python side (time.perf_counter)
+
+    @property
+    def complete(self):
+        """The keystroke and the rendered results were both seen"""
+        return self.input_to_render is not None
+
+    @property
+    def client_side(self):
+        """Results rendered without a search API call after the keystroke"""
+        return self.complete and self.api_url is None
+
+    def __str__(self):
+        def ms(seconds):
+            return "n/a" if seconds is None else f"{seconds * 1000:.0f}ms"
+        if self.client_side:
+            return f"search '{self.term}': no search API call, input->render {ms(self.input_to_render)} (client-side)"
+        return (f"search '{self.term}': input->response {ms(self.input_to_response)}, "
+                f"response->render {ms(self.response_to_render)}, input->render {ms(self.input_to_render)}")
+
+    @classmethod
+    def from_script(cls, result, term, dispatch=None):
+        """Build from the SEARCH_LATENCY_RESULT_JS result (milliseconds)"""
+        keydown, response = result.get("keydown"), result.get("response")
+
+        def seconds(start, end):
+            return None if start is None or end is None else max(0.0, end - start) / 1000.0
+
+        render = result.get("render") if response is not None else result.get("firstMutation")
+        return cls(
+            term=term,
+            api_url=result.get("url"),
+            input_to_request=seconds(keydown, result.get("request")),
+            input_to_response=seconds(keydown, response),
+            response_to_render=seconds(response, result.get("render")),
+            input_to_render=seconds(keydown, render),
+            dispatch=dispatch
+        )
+
+
+def collect_search_latency(driver, term, submit, grid_selector, timeout=Config.SEARCH_LATENCY_TIMEOUT,
+                           api_path=Config.SEARCH_API_PATH, grace_ms=Config.SEARCH_API_GRACE_MS):
+    """
+    Time a search from browser events instead of our own waits
+
+    Arms the timeline, calls submit() (which must press Enter in the search
+    field) and waits in the browser for the response and the results render.
+
+    Returns:
+        SearchLatency
+    """
+    driver.execute_script(SEARCH_LATENCY_JS, api_path, grid_selector)
+    start = time.perf_counter()
+    submit()
+    dispatch = time.perf_counter() - start
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        result = driver.execute_async_script(SEARCH_LATENCY_RESULT_JS, int(timeout * 1000), grace_ms)
+    finally:
+        driver.set_script_timeout(previous_timeout)
+    return SearchLatency.from_script(result or {}, term, dispatch)
@@ -0,0 +1,85 @@
+"""
+HTML report writer
+Renders self-contained HTML reports from ResultStore entries, styled like
+the pytest-html reports
+"""
+import html
+import os
+from datetime import datetime
+from config.config import Config
+
+
+STYLE_FILE = os.path.join(Config.REPORTS_DIR, "assets", "style.css")
+FAILING_OUTCOMES = ("failed", "error", "xpassed")
+
+
+def suite_passed(results):
+    """True when none of the results failed or was lost to an environment outage"""
+    return bool(results) and not any(r["outcome"] in FAILING_OUTCOMES or r.get("environment") for r in results)
+
+
+def write_html_report(results, path, title):
+    """
+    Write a self-contained HTML report
+
+    Args:
+        results: list of ResultStore entries
+        path: Output file
+        title: Report heading
+
+    Returns:
+        Path of the written report
+    """
+    try:
+        with open(STYLE_FILE, encoding="utf-8") as f:
+            style = f.read()
+    except OSError:
+        style = ""
+
+    counts = {}
+    for entry in results:
+        counts[entry["outcome"]] = counts.get(entry["outcome"], 0) + 1
+    total_duration = sum(entry["duration"] for entry in results)
+
+    summary = ", ".join(
+        f'<span class="{html.escape(outcome)}">{count} {html.escape(outcome)}</span>'
+        for outcome, count in sorted(counts.items())
+    )
+    rows = "\n".join(_format_row(entry) for entry in results)
+
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8"/>
+<title>{html.escape(title)}</title>
+<style>{style}</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>Report generated on {datetime.now().strftime("%d-%b-%Y at %H:%M:%S")}</p>
+<h2>Summary</h2>
+<p>{len(results)} tests took {total_duration:.2f} seconds.</p>
+<p>{summary}</p>
+<h2>Results</h2>
+<table id="results-table">
+<thead><tr><th>Result</th><th>Test</th><th>Duration</th></tr></thead>
+{rows}
+</table>
+</body>
+</html>
+"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return path
+
+
+def _format_row(entry):
+    outcome = html.escape(entry["outcome"])
+    row = (f'<tbody class="{outcome} results-table-row"><tr>'
+           f'<td class="col-result">{outcome.capitalize()}</td>'
+           f'<td class="col-name">{html.escape(entry["nodeid"])}</td>'
+           f'<td class="col-duration">{entry["duration"]:.2f}</td></tr>')
+    if entry.get("longrepr"):
+        row += f'<tr><td class="extra" colspan="3"><div class="log">{html.escape(entry["longrepr"])}</div></td></tr>'
+    return row + "</tbody>"
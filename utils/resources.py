@@ -0,0 +1,70 @@
+"""
+Host resource checks
+Decides how many browsers this machine can run at once
+"""
+import os
+import platform
+import subprocess
+from config.config import Config
+
+
+def cpu_count():
+    """Usable CPU cores (respects CPU affinity where available)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_memory_mb():
+    """Memory available for new processes in MB, or None if unknown"""
+    system = platform.system()
+    try:
+        if system == "Linux":
+            with open("/proc/meminfo", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        elif system == "Darwin":
+            output = subprocess.run(["vm_stat"], capture_output=True, text=True, timeout=5).stdout
+            page_size = os.sysconf("SC_PAGE_SIZE")
+            pages = 0
+            for line in output.splitlines():
+                if line.startswith(("Pages free", "Pages inactive", "Pages speculative")):
+                    pages += int(line.split(":")[1].strip().rstrip("."))
+            return pages * page_size // (1024 * 1024)
+        elif system == "Windows":
+            import ctypes
+
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+            status = MemoryStatus()
+            status.dwLength = ctypes.sizeof(MemoryStatus)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullAvailPhys // (1024 * 1024)
+    except (OSError, ValueError, subprocess.SubprocessError, AttributeError):
+        pass
+    return None
+
+
+def max_browser_slots(per_browser_mb=Config.BROWSER_MEMORY_MB, limit=None):
+    """
+    How many browsers can run concurrently on this host
+
+    Bounded by CPU cores and by available memory / per-browser footprint.
+
+    Args:
+        per_browser_mb: Memory budget for one browser session and its driver
+        limit: Optional upper bound (e.g. the number of suites)
+    """
+    slots = cpu_count()
+    memory = available_memory_mb()
+    if memory is not None:
+        slots = min(slots, memory // per_browser_mb)
+    if limit is not None:
+        slots = min(slots, limit)
+    return max(1, slots)
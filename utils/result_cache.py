@@ -0,0 +1,187 @@
+"""
+Content-hash result cache
+Skips tests whose source closure and target app build are unchanged since
+they last passed
+"""
+import ast
+import hashlib
+import inspect
+import json
+import os
+import re
+import time
+from urllib.parse import urljoin, urlsplit
+import requests
+from config.config import Config
+from utils.file_lock import FileLock
+
+
+MAIN_BUNDLE = re.compile(r"<script[^>]+src=[\"']([^\"']*main[^\"']*\.js)[\"']")  # Angular main bundle
+
+
+class ResultCache:
+    """Passed results keyed by a hash of what the test depends on"""
+
+    def __init__(self, path=Config.RESULT_CACHE_FILE, ttl=Config.RESULT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._entries = None
+        self._file_hashes = {}
+        self._closures = {}
+        self._fingerprint = False  # False = not fetched yet, None = unavailable
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def app_fingerprint(self):
+        """
+        Fingerprint of the deployed app build: the API's version endpoint plus
+        the frontend at BASE_URL (index page and its main bundle), so a new UI
+        build changes the keys even when the API did not. None when either is
+        unreachable.
+        """
+        if self._fingerprint is False:
+            api = Config.API_URL.rstrip("/")
+            frontend = "{0.scheme}://{0.netloc}/".format(urlsplit(Config.BASE_URL))
+            try:
+                version = _fetch(f"{api}/rest/admin/application-version")
+                index = _fetch(frontend)
+                digest = hashlib.sha256(version.content + index.content)
+                for src in MAIN_BUNDLE.findall(index.text):
+                    digest.update(_fetch(urljoin(frontend, src)).content)
+                self._fingerprint = digest.hexdigest()
+            except requests.RequestException:
+                self._fingerprint = None
+        return self._fingerprint
+
+    def key(self, item):
+        """
+        Cache key for a collected test, or None when it cannot be cached
+
+        Covers the test function, the non-test code of its module (fixtures,
+        helpers), every project module imported from there or from conftest
+        (pages, utils, config), the parametrize id and the app build.
+        """
+        if any(item.get_closest_marker(m) for m in Config.RESULT_CACHE_EXCLUDE_MARKERS):
+            return None
+        fingerprint = self.app_fingerprint()
+        if fingerprint is None:
+            return None
+        try:
+            function_source = inspect.getsource(item.function)
+        except (OSError, TypeError):
+            return None
+
+        module_path = str(item.path)
+        conftest = os.path.join(Config.BASE_DIR, "tests", "conftest.py")
+        digest = hashlib.sha256()
+        for part in (item.nodeid, fingerprint, function_source, self._module_support(module_path)):
+            digest.update(part.encode("utf-8"))
+        imported = (self._closure(module_path) - {module_path}) | self._closure(conftest)
+        for path in sorted(imported):
+            digest.update(path.encode("utf-8"))
+            digest.update(self._hash_file(path).encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, key):
+        """Cached entry for a key, or None when missing or expired"""
+        entry = self.entries.get(key) if key else None
+        if entry and time.time() - entry["passed_at"] <= self.ttl:
+            return entry
+        return None
+
+    def store(self, results):
+        """
+        Remember the tests that passed in this run
+
+        Args:
+            results: iterable of ResultStore entries
+        """
+        with FileLock(self.path):
+            entries = self._read()
+            now = time.time()
+            for entry in results:
+                if entry["outcome"] == "passed" and entry.get("cache_key"):
+                    entries[entry["cache_key"]] = {
+                        "nodeid": entry["nodeid"],
+                        "duration": entry["duration"],
+                        "passed_at": now
+                    }
+            entries = {k: v for k, v in entries.items() if now - v["passed_at"] <= self.ttl}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self._entries = entries
+
+    def _module_support(self, path):
+        """Module source without its test functions (other tests must not invalidate this one)"""
+        tree = ast.parse(self._read_source(path))
+
+        def strip(body):
+            kept = []
+            for node in body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+                    continue
+                if isinstance(node, ast.ClassDef):
+                    node.body = strip(node.body) or [ast.Pass()]
+                kept.append(node)
+            return kept
+
+        tree.body = strip(tree.body)
+        return ast.unparse(tree)
+
+    def _closure(self, path):
+        """Project files imported, directly or transitively, by a source file"""
+        if path in self._closures:
+            return self._closures[path]
+        seen, pending = set(), [path]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            for node in ast.walk(ast.parse(self._read_source(current))):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+                else:
+                    continue
+                for name in names:
+                    candidate = os.path.join(Config.BASE_DIR, *name.split(".")) + ".py"
+                    if os.path.isfile(candidate):
+                        pending.append(candidate)
+        self._closures[path] = seen
+        return seen
+
+    def _hash_file(self, path):
+        if path not in self._file_hashes:
+            self._file_hashes[path] = hashlib.sha256(self._read_source(path).encode("utf-8")).hexdigest()
+        return self._file_hashes[path]
+
+    @staticmethod
+    def _read_source(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+def _fetch(url):
+    response = requests.get(url, timeout=Config.API_TIMEOUT)
+    response.raise_for_status()
+    return response
+
+
+# Global result cache instance
+result_cache = ResultCache()
@@ -0,0 +1,93 @@
+"""
+Test result store
+Records every test outcome once during a pytest run so that several reports
+can be written from the same result set
+"""
+import json
+import os
+from datetime import datetime
+
+
+CACHED_PASS = "cached-pass"  # Skipped because an identical test already passed
+RERUN = "rerun"  # Failed attempt that was retried
+
+class ResultStore:
+    """Collects one result entry per test from pytest reports"""
+
+    def __init__(self):
+        self.results = {}
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def record(self, report):
+        """Fold a setup/call/teardown report into the test's entry"""
+        entry = self.results.setdefault(report.nodeid, {
+            "nodeid": report.nodeid,
+            "file": report.nodeid.split("::")[0],
+            "outcome": "passed",
+            "duration": 0.0,
+            "longrepr": None,
+            "finished": None,
+            "profile": None,
+            "reruns": 0
+        })
+        entry["duration"] = round(entry["duration"] + getattr(report, "duration", 0.0), 3)
+        entry["finished"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        properties = dict(getattr(report, "user_properties", ()))
+        entry["profile"] = properties.get("profile", entry["profile"])
+        if "cache_key" in properties:
+            entry["cache_key"] = properties["cache_key"]
+        if "impact" in properties:
+            entry["impact"] = properties["impact"]
+        if "bug" in properties:
+            entry["bug"] = properties["bug"]
+        environment = properties.get("environment_failure") or properties.get("environment_skip")
+        if environment is not None:
+            entry["environment"] = environment  # Lost to an outage: never counts as passing
+
+        if report.outcome == RERUN:
+            entry["reruns"] += 1
+            return
+
+        if report.when == "call":
+            if hasattr(report, "wasxfail"):
+                entry["outcome"] = "xfailed" if report.skipped else "xpassed"
+            else:
+                entry["outcome"] = report.outcome
+        elif report.failed:
+            entry["outcome"] = "error"
+        elif report.skipped and report.when == "setup":
+            entry["outcome"] = CACHED_PASS if properties.get("cached") else "skipped"
+
+        if (report.failed or report.skipped) and report.longrepr is not None:
+            if report.skipped and isinstance(report.longrepr, tuple):
+                entry["longrepr"] = report.longrepr[2]
+            else:
+                entry["longrepr"] = str(report.longrepr)
+
+    def summary(self, results=None):
+        """Count results per outcome"""
+        counts = {}
+        for entry in (self.results.values() if results is None else results):
+            counts[entry["outcome"]] = counts.get(entry["outcome"], 0) + 1
+        return counts
+
+    def save(self, path):
+        """Write the result set as JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "started": self.started,
+                "finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "results": list(self.results.values())
+            }, f, indent=2)
+        return path
+
+    @staticmethod
+    def load(path):
+        """Read a saved result set, returns the list of result entries"""
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["results"]
+
+
+# Global result store instance
+result_store = ResultStore()
@@ -0,0 +1,94 @@
+"""
+Sleep budget tracking
+Records every fixed time.sleep() made by project code (pages, tests, utils)
+and reports how much fixed sleeping is left per test
+"""
+import json
+import os
+import sys
+import time
+from config.config import Config
+
+
+# Intentional poll loops (lock backoff), not fixed sleeps a test could drop
+POLL_LOOP_FILES = ("utils/file_lock.py",)
+
+
+class SleepBudget:
+    """Wraps time.sleep and attributes project sleeps to the running test"""
+
+    def __init__(self):
+        self.current_test = None
+        self.sleeps = {}
+        self._original_sleep = None
+
+    def install(self):
+        """Replace time.sleep with the recording wrapper"""
+        if self._original_sleep is not None:
+            return
+        self._original_sleep = time.sleep
+        original = self._original_sleep
+
+        def recording_sleep(seconds):
+            caller = sys._getframe(1).f_code.co_filename
+            if self._is_project_file(caller):
+                self.record(seconds, f"{os.path.relpath(caller, Config.BASE_DIR)}:{sys._getframe(1).f_lineno}")
+            original(seconds)
+
+        time.sleep = recording_sleep
+
+    def uninstall(self):
+        """Restore the original time.sleep"""
+        if self._original_sleep is not None:
+            time.sleep = self._original_sleep
+            self._original_sleep = None
+
+    def record(self, seconds, location):
+        """Attribute a fixed sleep to the current test"""
+        test = self.current_test or "<outside tests>"
+        self.sleeps.setdefault(test, []).append({"seconds": seconds, "location": location})
+
+    def start_test(self, nodeid):
+        self.current_test = nodeid
+
+    def end_test(self):
+        self.current_test = None
+
+    def total(self, test=None):
+        """Total fixed sleep in seconds, for one test or the whole run"""
+        if test is not None:
+            return sum(s["seconds"] for s in self.sleeps.get(test, []))
+        return sum(s["seconds"] for entries in self.sleeps.values() for s in entries)
+
+    def generate_report(self, worker_id=None):
+        """Write the per-test sleep budget as JSON and print the worst offenders"""
+        per_test = {
+            test: {
+                "total_s": round(self.total(test), 3),
+                "calls": len(entries),
+                "locations": sorted({e["location"] for e in entries})
+            }
+            for test, entries in self.sleeps.items()
+        }
+        name = f"sleep_budget_{worker_id}.json" if worker_id else "sleep_budget.json"
+        report_file = os.path.join(Config.REPORTS_DIR, name)
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump({"total_s": round(self.total(), 3), "tests": per_test}, f, indent=2)
+
+        print(f"\n😴 Fixed sleep left: {self.total():.1f}s across {len(per_test)} tests")
+        worst = sorted(per_test.items(), key=lambda item: item[1]["total_s"], reverse=True)[:5]
+        for test, data in worst:
+            print(f"   {data['total_s']:6.1f}s  {test}")
+        return report_file
+
+    def _is_project_file(self, filename):
+        if filename.startswith("<"):
+            return False
+        filename = os.path.abspath(filename)
+        if not filename.startswith(Config.BASE_DIR + os.sep) or "site-packages" in filename:
+            return False
+        return os.path.relpath(filename, Config.BASE_DIR).replace(os.sep, "/") not in POLL_LOOP_FILES
+
+
+# Global sleep budget instance
+sleep_budget = SleepBudget()
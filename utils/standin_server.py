@@ -0,0 +1,170 @@
+"""
+Local stand-in for the app's REST API
+A keep-alive HTTP/1.1 server on asyncio with the search, registration,
+login and basket endpoints the UI calls, so protocol-level load runs in CI
+without the real app
+"""
+import asyncio
+import json
+import secrets
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+
+PRODUCTS = [
+    {"id": 1, "name": "Apple Juice (1000ml)", "description": "The all-time classic.", "price": 1.99},
+    {"id": 2, "name": "Orange Juice (1000ml)", "description": "Made from oranges hand-picked by Uncle Dittmeyer.",
+     "price": 2.99},
+    {"id": 3, "name": "Eggfruit Juice (500ml)", "description": "Now with even more exotic flavour.", "price": 8.99},
+    {"id": 4, "name": "Raspberry Juice (1000ml)", "description": "Made from blended Raspberry Pi, water and sugar.",
+     "price": 4.99},
+    {"id": 5, "name": "Lemon Juice (500ml)", "description": "Sour but full of vitamins.", "price": 2.99},
+    {"id": 6, "name": "Banana Juice (1000ml)", "description": "Monkeys love it the most.", "price": 1.99},
+    {"id": 7, "name": "Apple Pomace", "description": "Finest pressings of apples.", "price": 0.89},
+    {"id": 8, "name": "Green Smoothie", "description": "Looks poisonous but is actually very good for your health!",
+     "price": 1.99}
+]
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found"}
+
+
+class StandInServer:
+    """Minimal in-process API server (one event loop in a daemon thread)"""
+
+    def __init__(self, host="127.0.0.1", port=0, products=PRODUCTS):
+        self.host = host
+        self.port = port
+        self.products = products
+        self.users = {}  # email -> {"id", "password", "bid"}
+        self.tokens = {}  # token -> basket id
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving, returns the base URL"""
+        self._thread = threading.Thread(target=self._serve, name="standin-server", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("Stand-in server did not start")
+        print(f"🧪 Stand-in API server on {self.url}")
+        return self.url
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=1024))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = self.route(method, target, headers, body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method, target, headers, body):
+        """
+        Answer one request like the app would
+
+        Returns:
+            (status, JSON payload)
+        """
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+
+        if method == "GET" and path == "/rest/products/search":
+            term = parse_qs(url.query).get("q", [""])[0].lower()
+            matches = [p for p in self.products if term in p["name"].lower() or term in p["description"].lower()]
+            return 200, {"status": "success", "data": matches}
+
+        if method == "POST" and path == "/api/Users":
+            user = _json(body)
+            if not user.get("email") or not user.get("password"):
+                return 400, {"message": "Validation error: email and password are required"}
+            if user["email"] in self.users:
+                return 400, {"message": "Validation error: email must be unique"}
+            self.users[user["email"]] = {"id": len(self.users) + 1, "password": user["password"],
+                                         "bid": len(self.users) + 1}
+            return 201, {"status": "success", "data": {"id": self.users[user["email"]]["id"], "email": user["email"]}}
+
+        if method == "POST" and path == "/rest/user/login":
+            credentials = _json(body)
+            user = self.users.get(credentials.get("email"))
+            if user is None or user["password"] != credentials.get("password"):
+                return 401, {"message": "Invalid email or password."}
+            token = secrets.token_hex(16)
+            self.tokens[token] = user["bid"]
+            return 200, {"authentication": {"token": token, "bid": user["bid"], "umail": credentials["email"]}}
+
+        if method == "GET" and path.startswith("/rest/basket/"):
+            token = headers.get("authorization", "").removeprefix("Bearer ")
+            if token not in self.tokens:
+                return 401, {"message": "No Authorization header was found"}
+            bid = path.rsplit("/", 1)[1]
+            return 200, {"status": "success", "data": {"id": int(bid) if bid.isdigit() else bid, "Products": []}}
+
+        if method == "GET" and path == "/rest/admin/application-version":
+            return 200, {"version": "stand-in"}
+
+        return 404, {"message": f"Unexpected path: {url.path}"}
+
+
+def _json(body):
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
@@ -0,0 +1,157 @@
+"""
+Test history store
+Keeps recent per-test durations, outcomes (flakiness), fixture profiles and
+impact data across runs, shared safely between processes
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+from datetime import datetime
+from config.config import Config
+from utils.file_lock import FileLock
+
+
+def parse_shard(value):
+    """Parse a "I/N" shard spec (1-based) into (I, N)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {value!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+class TestHistory:
+    """JSON history keyed by pytest nodeid"""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, path=Config.TEST_HISTORY_FILE, samples=Config.HISTORY_SAMPLES):
+        self.path = path
+        self.samples = samples
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def update(self, results):
+        """
+        Merge a run's results into the history
+
+        Args:
+            results: iterable of ResultStore entries
+        """
+        with FileLock(self.path):
+            data = self._read()
+            for entry in results:
+                if entry["outcome"] not in ("passed", "failed"):
+                    continue  # skipped/errored runs say nothing about duration
+                test = data.setdefault(entry["nodeid"], {"durations": []})
+                test["durations"] = (test["durations"] + [entry["duration"]])[-self.samples:]
+                if entry["outcome"] == "failed":
+                    run = "failed"
+                else:
+                    run = "flaky" if entry.get("reruns") else "passed"
+                test["recent"] = (test.get("recent", []) + [run])[-self.samples:]
+                if entry.get("profile"):
+                    test["profile"] = entry["profile"]
+                if entry.get("impact") is not None:
+                    test["impact"] = entry["impact"]
+                test["last_run"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._write(data)
+        self._data = data
+
+    def digest(self):
+        """Short hash of the history contents, to check that shards split from the same snapshot"""
+        return hashlib.sha256(json.dumps(self.data, sort_keys=True).encode()).hexdigest()[:12]
+
+    def duration(self, nodeid, default=None):
+        """Median of the recorded durations, or default when unknown"""
+        durations = self.data.get(nodeid, {}).get("durations")
+        if not durations:
+            return default
+        return statistics.median(durations)
+
+    def default_duration(self):
+        """Median duration over all known tests, used for tests never seen before"""
+        known = [self.duration(nodeid) for nodeid in self.data if self.data[nodeid].get("durations")]
+        return statistics.median(known) if known else Config.DEFAULT_TEST_DURATION
+
+    def profile(self, nodeid):
+        """Recorded fixture profile, falling back to the parametrize id in the nodeid"""
+        recorded = self.data.get(nodeid, {}).get("profile")
+        if recorded:
+            return recorded
+        if nodeid.endswith("]") and "[" in nodeid:
+            return nodeid[nodeid.rindex("[") + 1:-1]
+        return "default"
+
+    def flake_rate(self, nodeid):
+        """Share of recent runs that failed first and passed on retry"""
+        recent = self.data.get(nodeid, {}).get("recent", [])
+        return recent.count("flaky") / len(recent) if recent else 0.0
+
+    def is_quarantined(self, nodeid):
+        """Chronically flaky: enough recent runs and a flake rate at or above the limit"""
+        recent = self.data.get(nodeid, {}).get("recent", [])
+        return (len(recent) >= Config.QUARANTINE_MIN_RUNS
+                and self.flake_rate(nodeid) >= Config.QUARANTINE_FLAKE_RATE)
+
+    def quarantined(self):
+        """Nodeids currently in quarantine"""
+        return sorted(nodeid for nodeid in self.data if self.is_quarantined(nodeid))
+
+    def impact(self, nodeid):
+        """Page methods and locators the test exercised when last recorded, or None"""
+        return self.data.get(nodeid, {}).get("impact")
+
+    def partition(self, nodeids, count, offset=0):
+        """
+        Split tests into count shards of similar total duration
+
+        Greedy longest-first into the least loaded shard. The result only
+        depends on the nodeids and their recorded durations, so every shard
+        must split from the same frozen snapshot (see digest) and no shard
+        may update it while the others still have to start.
+
+        Args:
+            offset: Shard (0-based) that wins ties first. run_all_tests splits
+                    each suite separately and rotates it per suite, so the
+                    leftovers of equal-length tests do not all land on shard 1.
+
+        Returns:
+            list of count lists of nodeids
+        """
+        known = [d for d in (self.duration(n) for n in nodeids) if d is not None]
+        default = statistics.median(known) if known else Config.DEFAULT_TEST_DURATION
+        shards = [[] for _ in range(count)]
+        loads = [0.0] * count
+        for nodeid in sorted(nodeids, key=lambda n: (-self.duration(n, default), n)):
+            index = min(range(count), key=lambda i: (loads[i], (i - offset) % count))
+            shards[index].append(nodeid)
+            loads[index] += self.duration(nodeid, default)
+        return shards
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+# Global test history instance
+test_history = TestHistory()
@@ -0,0 +1,55 @@
+"""
+Network and CPU throttling through the Chrome DevTools Protocol
+Applies the named Config.THROTTLING_PROFILES to a browser session
+"""
+import argparse
+from config.config import Config
+
+
+def parse_profiles(value):
+    """Parse a comma-separated list of throttling profile names"""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in Config.THROTTLING_PROFILES]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"expected profiles from {', '.join(Config.THROTTLING_PROFILES)}, got {value!r}")
+    return names
+
+
+def apply_throttling(driver, profile_name):
+    """
+    Throttle a session's network and CPU ("none" lifts both)
+
+    Conditions stay with the tab across navigations until changed again.
+
+    Returns:
+        True if applied, False when the browser has no DevTools protocol
+    """
+    if profile_name not in Config.THROTTLING_PROFILES:
+        raise ValueError(f"Unknown throttling profile: {profile_name}")
+    if not hasattr(driver, "execute_cdp_cmd"):
+        if profile_name != "none":
+            print(f"⚠️ Throttling profile '{profile_name}' needs Chromium, timings are unthrottled")
+        return False
+
+    profile = Config.THROTTLING_PROFILES[profile_name]
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile["latency"],
+        "downloadThroughput": _bytes_per_second(profile["download_kbps"]),
+        "uploadThroughput": _bytes_per_second(profile["upload_kbps"]),
+    })
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_rate"]})
+    driver._throttling = profile_name
+    return True
+
+
+def clear_throttling(driver):
+    """Lift throttling from a session if a profile was applied"""
+    if getattr(driver, "_throttling", "none") != "none":
+        apply_throttling(driver, "none")
+
+
+def _bytes_per_second(kbps):
+    return -1 if kbps is None else kbps * 1000 / 8  # -1 disables the limit
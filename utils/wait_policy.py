@@ -0,0 +1,114 @@
+"""
+Wait policy
+Owns all WebDriver timing: implicit wait is forced to zero, every explicit wait
+gets its own deadline, and time spent past a deadline is reported
+"""
+import json
+import os
+import sys
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from config.config import Config
+from utils.browser_scripts import DOM_SETTLED_JS
+
+
+class WaitPolicy:
+    """Single owner of implicit and explicit waits"""
+
+    def __init__(self, tolerance=Config.WAIT_OVERSHOOT_TOLERANCE):
+        self.tolerance = tolerance
+        self.current_test = None
+        self.lost = []
+
+    def apply(self, driver):
+        """Force implicit wait to zero and keep it there"""
+        original = driver.implicitly_wait
+        original(0)
+
+        def implicitly_wait(seconds):
+            if seconds:
+                self._record(0, 0, f"implicitly_wait({seconds}) ignored, forced to 0")
+            original(0)
+
+        driver.implicitly_wait = implicitly_wait
+        return driver
+
+    def until(self, driver, condition, timeout, message="", poll_frequency=0.5):
+        """
+        Explicit wait with its own deadline
+
+        Time spent beyond the deadline (a slow poll, a blocking command inside
+        the condition) is recorded as lost to stacked waits.
+        """
+        start = time.monotonic()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition, message)
+        finally:
+            elapsed = time.monotonic() - start
+            if elapsed - timeout > self.tolerance:
+                self._record(timeout, elapsed, message or getattr(condition, "__name__", repr(condition)))
+
+    def wait_absent(self, driver, locator, timeout=5):
+        """
+        Wait for an element to be absent
+
+        Returns immediately when nothing matches and the page is already settled
+        (document loaded, no fetch/XHR in flight, Angular stable).
+
+        Returns:
+            True if absent, False if still present at the deadline
+        """
+        def absent_and_settled(d):
+            return not d.find_elements(*locator) and d.execute_script(DOM_SETTLED_JS)
+
+        if absent_and_settled(driver):
+            return True
+        try:
+            self.until(driver, absent_and_settled, timeout, f"{locator} still present", poll_frequency=0.1)
+            return True
+        except Exception:
+            return not driver.find_elements(*locator)
+
+    def start_test(self, nodeid):
+        self.current_test = nodeid
+
+    def end_test(self):
+        self.current_test = None
+
+    def total_lost(self):
+        """Seconds spent past explicit wait deadlines"""
+        return sum(entry["lost_s"] for entry in self.lost)
+
+    def generate_report(self, worker_id=None):
+        """Write time lost to stacked waits as JSON and print a summary"""
+        per_test = {}
+        for entry in self.lost:
+            test = per_test.setdefault(entry["test"], {"lost_s": 0.0, "waits": []})
+            test["lost_s"] = round(test["lost_s"] + entry["lost_s"], 3)
+            test["waits"].append(entry)
+
+        name = f"wait_policy_{worker_id}.json" if worker_id else "wait_policy.json"
+        report_file = os.path.join(Config.REPORTS_DIR, name)
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump({"lost_s": round(self.total_lost(), 3), "tests": per_test}, f, indent=2)
+
+        print(f"\n⌛ Time lost past wait deadlines: {self.total_lost():.1f}s in {len(self.lost)} waits")
+        return report_file
+
+    def _record(self, timeout, elapsed, description):
+        # Attribute to the first frame outside the wait plumbing
+        caller = sys._getframe(1)
+        while caller.f_back and os.path.basename(caller.f_code.co_filename) in ("wait_policy.py", "base_page.py"):
+            caller = caller.f_back
+        self.lost.append({
+            "test": self.current_test or "<outside tests>",
+            "timeout_s": timeout,
+            "elapsed_s": round(elapsed, 3),
+            "lost_s": round(max(0.0, elapsed - timeout), 3),
+            "wait": str(description)[:200],
+            "location": f"{os.path.relpath(caller.f_code.co_filename, Config.BASE_DIR)}:{caller.f_lineno}"
+        })
+
+
+# Global wait policy instance
+wait_policy = WaitPolicy()